@@ -0,0 +1,119 @@
+import os
+import re
+import json
+import bisect
+import unicodedata
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_AIRPORTS_PATH = os.path.join(os.path.dirname(__file__), "..", "configs", "airports.json")
+# Trailing IATA code in an autocomplete label, e.g. "Delhi (DEL)"
+LABEL_CODE_RE = re.compile(r"\(\s*([A-Za-z]{3})\s*\)\s*$")
+
+
+def normalize_term(text: str) -> str:
+    """Normalize user input for matching (Unicode NFC, casefold, collapsed whitespace)"""
+    text = unicodedata.normalize("NFC", str(text or ""))
+    return " ".join(text.casefold().split())
+
+
+class AirportIndex:
+    """
+    In-memory prefix index over airports.
+    - Indexes IATA codes, English/Hindi city names, airport names and transliterations
+    - Prefix lookup is a binary search over a sorted term array
+    - Results are ranked by exact match, then popularity
+    """
+
+    def __init__(self, airports: List[Dict[str, Any]]):
+        self.airports = {airport["code"].upper(): airport for airport in airports}
+
+        entries = set()
+        for code, airport in self.airports.items():
+            terms = [code, airport.get("city"), airport.get("city_hi"), airport.get("name")]
+            terms.extend(airport.get("aliases", []))
+            for term in terms:
+                term = normalize_term(term)
+                if term:
+                    entries.add((term, code))
+
+        # Parallel sorted arrays: bisect on terms, read codes at the same index
+        sorted_entries = sorted(entries)
+        self._terms = [term for term, _ in sorted_entries]
+        self._codes = [code for _, code in sorted_entries]
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_AIRPORTS_PATH) -> "AirportIndex":
+        """Build the index from a JSON airports file"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["airports"])
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\uffff", lo=start)
+        return start, end
+
+    def autocomplete(self, query: str, limit: int = 8, language: str = "en") -> List[Dict[str, Any]]:
+        """
+        Return airports whose code, city name or alias starts with `query`.
+
+        Args:
+            query: Partial user input (English, Hindi or transliterated)
+            limit: Maximum number of suggestions
+            language: Language used for the display label (en, hi)
+
+        Returns:
+            List of airport suggestions ranked by relevance
+        """
+        prefix = normalize_term(query)
+        if not prefix:
+            return []
+
+        start, end = self._prefix_range(prefix)
+        best: Dict[str, bool] = {}
+        for i in range(start, end):
+            code = self._codes[i]
+            best[code] = best.get(code, False) or self._terms[i] == prefix
+
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (not item[1], -self.airports[item[0]].get("popularity", 0), item[0])
+        )
+        return [self._suggestion(code, language) for code, _ in ranked[:limit]]
+
+    def resolve(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve input to a single airport, or None.
+        Accepts an autocomplete `label` ("Delhi (DEL)") or an exact indexed term.
+        A label only counts when its text names the same airport as its code.
+        """
+        text = str(text or "")
+        label_code = LABEL_CODE_RE.search(text)
+        if label_code and label_code.group(1).upper() in self.airports:
+            code = label_code.group(1).upper()
+            label = normalize_term(text)
+            if (code in self._exact_matches(normalize_term(text[:label_code.start()]))
+                    or any(label == normalize_term(self._suggestion(code, lang)["label"]) for lang in ("en", "hi"))):
+                return self.airports[code]
+
+        matches = self._exact_matches(normalize_term(text))
+        if not matches:
+            return None
+        code = max(matches, key=lambda c: self.airports[c].get("popularity", 0))
+        return self.airports[code]
+
+    def _exact_matches(self, term: str) -> List[str]:
+        """Codes of the airports indexed under exactly `term`"""
+        if not term:
+            return []
+        start, end = self._prefix_range(term)
+        return [self._codes[i] for i in range(start, end) if self._terms[i] == term]
+
+    def _suggestion(self, code: str, language: str) -> Dict[str, Any]:
+        airport = self.airports[code]
+        city = airport.get("city_hi") if language == "hi" and airport.get("city_hi") else airport.get("city")
+        return {
+            "code": code,
+            "city": city,
+            "name": airport.get("name"),
+            "label": f"{city} ({code})"
+        }
@@ -0,0 +1,183 @@
+import os
+import gzip
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+# Input fields hashed before they are queued
+PII_FIELDS = frozenset({"mobile", "email", "last_name", "lastname", "name", "phone", "pnr"})
+# Raw user input; a value here that is not a dict or list is hashed whole
+RAW_INPUT_FIELDS = frozenset({"data"})
+
+
+class AuditLog:
+    """
+    Append-only audit trail of flow transitions.
+    - `record` only hashes PII and appends to an in-memory queue (no I/O)
+    - A background task writes batches as gzip members of line-delimited JSON
+    - Files rotate by size and age; the queue is bounded and drops new events
+      (counted in `dropped`) rather than blocking requests
+    - `stop` flushes everything still queued
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        hash_key: bytes,
+        batch_size: int = 500,
+        flush_interval: float = 2.0,
+        max_queue: int = 50_000,
+        max_file_bytes: int = 50 * 1024 * 1024,
+        rotate_seconds: float = 3600
+    ):
+        self.directory = directory
+        # BLAKE2b keyed mode is a MAC and much cheaper than HMAC on the request path
+        self.hash_key = hashlib.sha256(hash_key).digest()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_file_bytes = max_file_bytes
+        self.rotate_seconds = rotate_seconds
+
+        self.queue: deque = deque()
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._file_path: Optional[str] = None
+        self._file_opened = 0.0
+        self._file_bytes = 0
+
+    @classmethod
+    def from_env(cls) -> "AuditLog":
+        """Build the audit log from AUDIT_* environment variables"""
+        directory = os.getenv("AUDIT_LOG_DIR", os.path.join(os.path.dirname(__file__), "..", "audit_logs"))
+        hash_key = os.getenv("AUDIT_HASH_KEY")
+        if not hash_key:
+            hash_key = os.urandom(32).hex()
+            print("⚠️  AUDIT_HASH_KEY not set - PII hashes will not match across restarts")
+        return cls(
+            directory,
+            hash_key.encode(),
+            batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "500")),
+            flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "2.0")),
+            max_queue=int(os.getenv("AUDIT_MAX_QUEUE", "50000"))
+        )
+
+    def record(self, flow: str, event: str, uid: str, **fields) -> None:
+        """Queue an audit event; never blocks and never raises on the request path"""
+        if len(self.queue) >= self.max_queue:
+            self.dropped += 1
+            return
+
+        entry = {"ts": time.time(), "flow": flow, "event": event, "uid": uid}
+        for key, value in fields.items():
+            if isinstance(value, (dict, list, tuple)):
+                entry[key] = self._scrub_value(key, value)
+            elif value is not None and (key in PII_FIELDS or key in RAW_INPUT_FIELDS):
+                entry[key] = self.hash_value(value)
+            else:
+                entry[key] = value
+        self.queue.append(entry)
+        self.recorded += 1
+
+        if self._wake is not None and len(self.queue) >= self.batch_size:
+            self._wake.set()
+
+    def hash_value(self, value: Any) -> str:
+        """Short keyed hash so PII can be correlated but not read back"""
+        digest = hashlib.blake2b(str(value).strip().lower().encode(), key=self.hash_key, digest_size=8)
+        return "h:" + digest.hexdigest()
+
+    def _scrub_value(self, key: str, value: Any) -> Any:
+        """Hash PII under `key`, recursing into dicts, lists and tuples"""
+        if isinstance(value, dict):
+            scrubbed = {}
+            for k, v in value.items():
+                if isinstance(v, (dict, list, tuple)):
+                    scrubbed[k] = self._scrub_value(k, v)
+                elif k in PII_FIELDS and v is not None:
+                    scrubbed[k] = self.hash_value(v)
+                else:
+                    scrubbed[k] = v
+            return scrubbed
+        if isinstance(value, (list, tuple)):
+            return [self._scrub_value(key, item) for item in value]
+        if key in PII_FIELDS and value is not None:
+            return self.hash_value(value)
+        return value
+
+    def start(self) -> None:
+        """Start the background writer on the running event loop"""
+        if self._task:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._writer())
+
+    async def stop(self) -> None:
+        """Stop the writer and flush everything still queued"""
+        if self._task:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        while self.queue:
+            await asyncio.to_thread(self._write_batch, self._drain())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": len(self.queue),
+            "current_file": self._file_path
+        }
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch = []
+        while self.queue and len(batch) < self.batch_size:
+            batch.append(self.queue.popleft())
+        return batch
+
+    async def _writer(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            while self.queue:
+                batch = self._drain()
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                except Exception as e:
+                    logger.error(f"Audit log write failed, {len(batch)} events lost: {str(e)}")
+                    self.dropped += len(batch)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        now = time.time()
+        if (self._file_path is None or self._file_bytes >= self.max_file_bytes
+                or now - self._file_opened >= self.rotate_seconds):
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(now))
+            self._file_path = os.path.join(self.directory, f"audit-{stamp}-{os.getpid()}.jsonl.gz")
+            self._file_opened = now
+            self._file_bytes = 0
+
+        lines = "".join(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n" for entry in batch)
+        # Each batch is a complete gzip member, so a crash never corrupts earlier batches
+        data = gzip.compress(lines.encode("utf-8"))
+        with open(self._file_path, "ab") as f:
+            f.write(data)
+        self._file_bytes += len(data)
+        self.written += len(batch)
@@ -1,12 +1,28 @@
-from typing import Optional
+import os
+import json
+from typing import Dict, Any, Optional
+from language_registry import registry
+
+# Per-flow bundles built by video_bundler.py, relative to the videos directory
+BUNDLE_DIR = "bundles"
+BUNDLE_MANIFEST = f"{BUNDLE_DIR}/manifest.json"
+DEFAULT_VIDEO_ROOT = os.path.join(os.path.dirname(__file__), "..", "videos")
+FLOW_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "configs", "flow_config.json")
+
+
+def load_video_files(path: str = FLOW_CONFIG_PATH) -> Dict[str, Dict[str, str]]:
+    """Per-flow step -> clip name (without language suffix) from the flow config"""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    return {flow: dict(config[flow].get("video_files", {})) for flow in ("booking", "checkin")}
 
 
 class AvatarEngine:
     """Handles avatar video URL generation for multilingual support"""
 
-    def __init__(self, base_ip: str = None):
+    def __init__(self, base_ip: str = None, languages=None, video_root: str = DEFAULT_VIDEO_ROOT,
+                 video_files: Optional[Dict[str, Dict[str, str]]] = None):
         # Use environment variable or default to localhost
-        import os
         if base_ip:
             # Check if it's an ngrok URL
             if 'ngrok' in base_ip or base_ip.startswith('http'):
@@ -18,26 +34,25 @@ class AvatarEngine:
         if not self.base_url.startswith('http'):
             self.base_url = f"http://localhost:8000{self.base_url}"
         
-        # Language folder mapping
-        self.language_folders = {
-            "en": "english",
-            "hi": "hindi"
-        }
+        # Language registry drives video folders and filename suffixes
+        self.languages = languages or registry
         
-        # Video filename mapping (without language suffix)
-        self.video_files = {
-            "welcome": "welcome",
-            "language_selection": "language_selection",
-            "origin_selection": "origin_selection",
-            "destination_selection": "destination_selection",
-            "date_selection": "date_selection",
-            "passenger_selection": "passenger_selection",
-            "flight_search": "flight_search",
-            "flight_selection": "flight_selection",
-            "passenger_details": "passenger_details",
-            "review_booking": "review_booking",
-            "payment": "payment_handoff"
-        }
+        # Video filename mapping (without language suffix), from configs/flow_config.json.
+        # Booking steps need an entry; check-in clips default to the step name.
+        video_files = video_files if video_files is not None else load_video_files()
+        self.video_files = video_files.get("booking", {})
+        self.checkin_video_files = video_files.get("checkin", {})
+
+        # Bundle offsets: flow -> video folder -> {"file", "steps": {step: [start, end]}}
+        self.bundles = self._load_bundles(video_root)
+
+    @staticmethod
+    def _load_bundles(video_root: str) -> Dict[str, Any]:
+        path = os.path.join(video_root, BUNDLE_MANIFEST)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
 
     def get_video_url(self, step: str, language: str = "en", folder: str = None) -> Optional[str]:
         """
@@ -45,27 +60,41 @@ class AvatarEngine:
         
         Args:
             step: The booking flow step name
-            language: Language code (en, hi)
+            language: Language code (any registered language)
             folder: Optional folder override (e.g., 'avatar_checkin')
             
         Returns:
             Full video URL or None if not found
         """
         # Check-in videos
+        video_config = self.languages.video_config(language)
+        lang_folder = video_config["video_folder"]
+
         if folder == "avatar_checkin":
-            lang_folder = self.language_folders.get(language, "english")
-            lang_suffix = "eng" if language == "en" else "hindi"
-            filename = f"{step}_{lang_suffix}.mp4"
+            filename = f"{self.checkin_video_files.get(step, step)}_{video_config['checkin_video_suffix']}.mp4"
             return f"{self.base_url}/avatar_checkin/{lang_folder}/{filename}"
         
         # Booking videos
         if step in self.video_files:
-            lang_folder = self.language_folders.get(language, "english")
-            lang_suffix = "en" if language == "en" else "hi"
-            filename = f"{self.video_files[step]}_{lang_suffix}.mp4"
+            filename = f"{self.video_files[step]}_{video_config['video_suffix']}.mp4"
             return f"{self.base_url}/{lang_folder}/{filename}"
         return None
 
+    def get_bundle_segment(self, step: str, language: str = "en", folder: str = None) -> Optional[Dict[str, Any]]:
+        """
+        Locate a step inside its flow's bundled video.
+
+        Returns:
+            {"url", "start", "end"} in seconds, or None if the step is not bundled
+        """
+        flow = "checkin" if folder == "avatar_checkin" else "booking"
+        lang_folder = self.languages.video_config(language)["video_folder"]
+        bundle = self.bundles.get(flow, {}).get(lang_folder)
+        if not bundle or step not in bundle["steps"]:
+            return None
+        start, end = bundle["steps"][step]
+        return {"url": f"{self.base_url}/{bundle['file']}", "start": start, "end": end}
+
     def get_subtitle_url(self, step: str, language: str = "en") -> Optional[str]:
         """Get subtitle URL for accessibility."""
         return None
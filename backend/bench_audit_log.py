@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Benchmark the request-path cost of AuditLog.record and the background write throughput
+"""
+import asyncio
+import glob
+import gzip
+import tempfile
+import time
+
+from audit_log import AuditLog
+
+
+async def run(count: int = 200_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        audit_log = AuditLog(directory, b"bench-key", max_queue=count)
+        step_input = {"mobile": "+919876543210", "email": "user@example.com", "pnr": "ABC123"}
+
+        start = time.perf_counter()
+        for i in range(count):
+            audit_log.record("checkin", "step", f"uid-{i % 1000}", step="mobile_collection",
+                             next_step="email_collection", language="en", data=step_input)
+        record_elapsed = time.perf_counter() - start
+
+        audit_log.start()
+        start = time.perf_counter()
+        await audit_log.stop()
+        flush_elapsed = time.perf_counter() - start
+
+        lines = sum(1 for path in glob.glob(f"{directory}/*.jsonl.gz") for _ in gzip.open(path, "rt"))
+
+    print(f"record(): {record_elapsed / count * 1e6:.2f} µs per event ({count:,} events)")
+    print(f"flush:    {flush_elapsed:.3f}s for {lines:,} lines ({count / flush_elapsed:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark the step validators over bulk fuzzed inputs
+"""
+import random
+import string
+import time
+from datetime import date, timedelta
+
+from validators import checkin_validator, booking_validator
+
+ALPHABET = string.ascii_letters + string.digits + " +-.@'()_" + "अआइकखगनमहि"
+
+
+def fuzz_text(rng: random.Random, max_len: int = 24) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_len)))
+
+
+def fuzzed_inputs(rng: random.Random, count: int) -> list:
+    """Mix of well-formed and garbage inputs for every validated field"""
+    today = date.today()
+    generators = [
+        ("pnr_collection", lambda: {"pnr": rng.choice([fuzz_text(rng, 8), "".join(rng.choices(string.ascii_uppercase + string.digits, k=6))])}),
+        ("lastname_collection", lambda: {"last_name": rng.choice([fuzz_text(rng), "Sharma", "D'Souza", "van der Berg"])}),
+        ("mobile_collection", lambda: {"mobile": rng.choice([fuzz_text(rng, 16), f"+91 {rng.randint(6000000000, 9999999999)}", f"0{rng.randint(6000000000, 9999999999)}"])}),
+        ("email_collection", lambda: {"email": rng.choice([fuzz_text(rng, 30), f"user{rng.randint(0, 999)}@example.com"])}),
+        ("seat_consent", lambda: {"consent": rng.choice([True, False, "yes", "no", fuzz_text(rng, 4)])}),
+        ("date_selection", lambda: {"date": rng.choice([fuzz_text(rng, 10), (today + timedelta(days=rng.randint(-30, 400))).isoformat()])}),
+        ("passenger_selection", lambda: {"passengers": {"adults": rng.randint(-1, 10), "children": rng.randint(0, 5), "infants": rng.choice([0, 1, 2, "x"])}})
+    ]
+    return [(step, make()) for step, make in (rng.choice(generators) for _ in range(count))]
+
+
+def run(count: int = 200_000, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    inputs = fuzzed_inputs(rng, count)
+    validators = {step: checkin_validator for step in checkin_validator.required}
+    validators.update({step: booking_validator for step in ("date_selection", "passenger_selection")})
+
+    errors = 0
+    start = time.perf_counter()
+    for step, user_input in inputs:
+        if validators[step].validate(step, user_input):
+            errors += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"Validated {count:,} fuzzed inputs in {elapsed:.3f}s")
+    print(f"  {elapsed / count * 1e6:.2f} µs per input, {errors:,} rejected")
+
+
+if __name__ == "__main__":
+    run()
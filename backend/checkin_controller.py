@@ -1,71 +1,57 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from avatar_engine import AvatarEngine
+from checkin_jobs import SUCCEEDED, FAILED, MockCheckinService, CheckinServiceError
+from validators import checkin_validator
+from language_catalog import catalogs
+from runtime_config import load_flow_tables
 
 
 class CheckinController:
     """Controls the web check-in flow with avatar guidance"""
 
-    def __init__(self, uid: str, language: str = "en", avatar_engine=None):
+    def __init__(self, uid: str, language: str = "en", avatar_engine=None, job_queue=None, audit_log=None,
+                 config_store=None):
         self.uid = uid
         self.language = language
         self.avatar_engine = avatar_engine
+        self.job_queue = job_queue
+        self.audit_log = audit_log
+        self.config_store = config_store
         self.current_step = None
         self.checkin_data = {}
+        self.job_id = None
 
-        self.messages = {
-            "en": {
-                "welcome_checkin": "Hello! I'll help you with web check-in. Let's get started!",
-                "pnr_collection": "Please enter your 6-character PNR number.",
-                "lastname_collection": "Please enter the last name used during booking.",
-                "mobile_collection": "Please provide your mobile number with country code (e.g., +91).",
-                "email_collection": "Please enter your email address to receive the boarding pass.",
-                "disclaimer_explanation": "Your check-in will be done automatically 6-12 hours before flight departure with a free seat based on availability.",
-                "seat_consent": "Do you consent to automatic seat assignment?",
-                "processing_checkin": "Processing your check-in request...",
-                "checkin_success": "Check-in successful! You'll receive your boarding pass via email 6-12 hours before departure.",
-                "checkin_error": "Unable to complete check-in. Please verify your details and try again."
-            },
-            "hi": {
-                "welcome_checkin": "नमस्ते! मैं आपकी वेब चेक-इन में मदद करूंगा। चलिए शुरू करते हैं!",
-                "pnr_collection": "कृपया अपना 6-अक्षर का PNR नंबर दर्ज करें।",
-                "lastname_collection": "कृपया बुकिंग के दौरान उपयोग किया गया अंतिम नाम दर्ज करें।",
-                "mobile_collection": "कृपया देश कोड के साथ अपना मोबाइल नंबर प्रदान करें (जैसे +91)।",
-                "email_collection": "बोर्डिंग पास प्राप्त करने के लिए अपना ईमेल पता दर्ज करें।",
-                "disclaimer_explanation": "आपकी चेक-इन उड़ान प्रस्थान से 6-12 घंटे पहले उपलब्धता के आधार पर मुफ्त सीट के साथ स्वचालित रूप से की जाएगी।",
-                "seat_consent": "क्या आप स्वचालित सीट असाइनमेंट के लिए सहमत हैं?",
-                "processing_checkin": "आपके चेक-इन अनुरोध को संसाधित किया जा रहा है...",
-                "checkin_success": "चेक-इन सफल! आपको प्रस्थान से 6-12 घंटे पहले ईमेल के माध्यम से बोर्डिंग पास प्राप्त होगा।",
-                "checkin_error": "चेक-इन पूरा करने में असमर्थ। कृपया अपने विवरण सत्यापित करें और पुनः प्रयास करें।"
-            }
-        }
+        if config_store:
+            self._use_current_config()
+        else:
+            self.step_flow = load_flow_tables()["checkin"]
+            self.catalogs = catalogs
 
-        self.step_flow = {
-            "welcome_checkin": "pnr_collection",
-            "pnr_collection": "lastname_collection",
-            "lastname_collection": "mobile_collection",
-            "mobile_collection": "email_collection",
-            "email_collection": "disclaimer_explanation",
-            "disclaimer_explanation": "seat_consent",
-            "seat_consent": "processing_checkin",
-            "processing_checkin": "checkin_success",
-            "checkin_success": "complete",
-            "checkin_error": "complete"
-        }
+    def _use_current_config(self) -> None:
+        """Adopt the live config snapshot; called once per step so a step never mixes versions"""
+        if self.config_store:
+            config = self.config_store.current
+            self.step_flow = config.flows["checkin"]
+            self.catalogs = config.catalogs
+            self.avatar_engine = config.avatar_engine
 
     async def start_checkin_flow(self, query: str, language: str) -> Dict[str, Any]:
         """Start the avatar-guided check-in flow"""
+        self._use_current_config()
         self.language = language
         self.current_step = "welcome_checkin"
-        
+        self._audit("flow_started", language=language)
+
         video_url = self.avatar_engine.get_video_url("welcome_checkin", language, folder="avatar_checkin")
-        message = self.messages.get(language, self.messages["en"]).get("welcome_checkin")
+        message = self._message(language, "welcome_checkin")
 
         return {
             "type": "avatar_checkin_flow",
             "step": "welcome_checkin",
             "avatar_video": video_url,
+            "avatar_segment": self.avatar_engine.get_bundle_segment("welcome_checkin", language, folder="avatar_checkin"),
             "message": message,
-            "next_step": "pnr_collection",
+            "next_step": self.step_flow.get("welcome_checkin", "complete"),
             "uid": self.uid,
             "show_input": True
         }
@@ -77,35 +63,46 @@ class CheckinController:
         language: str
     ) -> Dict[str, Any]:
         """Process a check-in step"""
+        self._use_current_config()
         self.language = language
-        
+
+        # The check-in job decides the outcome, never the step table
+        if step == "processing_checkin":
+            return await self.get_checkin_status(language)
+
+        # Validate and normalize input before it is stored; steps with required
+        # fields reject empty input here rather than at the end of the flow
+        invalid = checkin_validator.validate(step, user_input)
+        if invalid:
+            field, error = invalid
+            self._audit("validation_error", step=step, field=field, error=error)
+            return {
+                "type": "validation_error",
+                "step": step,
+                "field": field,
+                "message": self._message(language, error) or self._message(language, "missing_field"),
+                "avatar_video": self.avatar_engine.get_video_url(step, language, folder="avatar_checkin"),
+                "avatar_segment": self.avatar_engine.get_bundle_segment(step, language, folder="avatar_checkin")
+            }
         if user_input:
             self.checkin_data[step] = user_input
 
-        # Validation logic
-        if step == "pnr_collection" and user_input:
-            pnr = user_input.get("pnr", "")
-            if len(pnr) != 6:
-                return {
-                    "type": "validation_error",
-                    "step": step,
-                    "message": "PNR must be 6 characters" if language == "en" else "PNR 6 अक्षर का होना चाहिए",
-                    "avatar_video": self.avatar_engine.get_video_url(step, language, folder="avatar_checkin")
-                }
-
         # Get next step
         next_step = self.step_flow.get(step, "complete")
+        self._audit("step", step=step, next_step=next_step, language=language, data=user_input or {})
+        if next_step == "checkin_success":
+            return await self.get_checkin_status(language)
         
         # Special handling for processing step
         if next_step == "processing_checkin":
-            # Simulate API call
-            success = await self._process_checkin()
-            next_step = "checkin_success" if success else "checkin_error"
+            if self.job_queue:
+                # Hand off to the worker pool; the client polls get_checkin_status
+                return await self._submit_checkin(language)
+            return await self._checkin_inline(language)
         
         self.current_step = next_step
 
-        message_dict = self.messages.get(language, self.messages["en"])
-        message = message_dict.get(next_step, f"Processing {next_step}")
+        message = self._message(language, next_step, f"Processing {next_step}")
         video_url = self.avatar_engine.get_video_url(next_step, language, folder="avatar_checkin")
 
         response = {
@@ -113,6 +110,7 @@ class CheckinController:
             "step": next_step,
             "next_step": self.step_flow.get(next_step, "complete"),
             "avatar_video": video_url,
+            "avatar_segment": self.avatar_engine.get_bundle_segment(next_step, language, folder="avatar_checkin"),
             "message": message,
             "checkin_data": self.checkin_data
         }
@@ -124,13 +122,136 @@ class CheckinController:
         if next_step == "complete":
             response["type"] = "complete"
             response["avatar_video"] = None
+            response["avatar_segment"] = None
             response["next_step"] = None
 
         return response
 
-    async def _process_checkin(self) -> bool:
-        """Simulate check-in processing - integrate with actual API"""
-        # TODO: Integrate with actual check-in API
-        # For now, return success if all required fields are present
-        required_fields = ["pnr_collection", "lastname_collection", "mobile_collection", "email_collection"]
-        return all(field in self.checkin_data for field in required_fields)
+    def _audit(self, event: str, **fields) -> None:
+        if self.audit_log:
+            self.audit_log.record("checkin", event, self.uid, **fields)
+
+    def _message(self, language: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Localized check-in message from the compiled catalogs"""
+        return self.catalogs.get(language, f"checkin.{key}", default)
+
+    def export_state(self) -> Dict[str, Any]:
+        """Minimal state needed to resume this flow (used by stateless mode)"""
+        return {
+            "current_step": self.current_step,
+            "language": self.language,
+            "data": self.checkin_data,
+            "job_id": self.job_id
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Resume from a state produced by export_state"""
+        self.current_step = state.get("current_step")
+        self.language = state.get("language") or self.language
+        self.checkin_data = dict(state.get("data") or {})
+        self.job_id = state.get("job_id")
+
+    async def get_checkin_status(self, language: str, wait: float = 0) -> Dict[str, Any]:
+        """
+        Poll the check-in job started by processing_checkin.
+
+        Args:
+            language: Language code (en, hi)
+            wait: Seconds to wait for the job to finish before answering (long-poll)
+        """
+        self._use_current_config()
+        if not self.job_queue or not self.job_id:
+            return self._step_response("checkin_error", language)
+
+        job = await self.job_queue.wait_for_job(self.job_id, wait)
+        if not job:
+            return self._step_response("checkin_error", language)
+
+        if job["status"] in (SUCCEEDED, FAILED) and self.current_step == "processing_checkin":
+            self._audit("checkin_result", pnr=job["pnr"], job_id=job["job_id"], status=job["status"],
+                        attempts=job["attempts"], error=job.get("error_code"))
+
+        if job["status"] == SUCCEEDED:
+            response = self._step_response("checkin_success", language)
+            response["checkin_result"] = job["result"]
+            return response
+        if job["status"] == FAILED:
+            response = self._step_response("checkin_error", language)
+            response["error"] = job["error"]
+            return response
+
+        return self._processing_response(job, language)
+
+    async def _submit_checkin(self, language: str) -> Dict[str, Any]:
+        """Enqueue the check-in job keyed on PNR"""
+        payload = self._checkin_payload()
+        if not all(payload.get(field) for field in ("pnr", "last_name")):
+            return self._step_response("checkin_error", language)
+
+        job = await self.job_queue.submit(payload["pnr"], payload)
+        if not job:
+            response = self._step_response("checkin_error", language)
+            response["message"] = self._message(language, "checkin_busy")
+            response["retry_step"] = "seat_consent"
+            return response
+
+        self.job_id = job["job_id"]
+        self.current_step = "processing_checkin"
+        self._audit("checkin_submitted", pnr=job["pnr"], job_id=job["job_id"])
+        return self._processing_response(job, language)
+
+    def _processing_response(self, job: Dict[str, Any], language: str) -> Dict[str, Any]:
+        return {
+            "type": "checkin_processing",
+            "step": "processing_checkin",
+            "next_step": "processing_checkin",
+            "avatar_video": self.avatar_engine.get_video_url("processing_checkin", language, folder="avatar_checkin"),
+            "avatar_segment": self.avatar_engine.get_bundle_segment("processing_checkin", language, folder="avatar_checkin"),
+            "message": self._message(language, "processing_checkin"),
+            "job_id": job["job_id"],
+            "job_status": job["status"],
+            "poll_after_ms": 1000
+        }
+
+    def _step_response(self, step: str, language: str) -> Dict[str, Any]:
+        """Response for a terminal check-in step (checkin_success / checkin_error)"""
+        self.current_step = step
+        return {
+            "type": "checkin_complete",
+            "step": step,
+            "next_step": self.step_flow.get(step, "complete"),
+            "avatar_video": self.avatar_engine.get_video_url(step, language, folder="avatar_checkin"),
+            "avatar_segment": self.avatar_engine.get_bundle_segment(step, language, folder="avatar_checkin"),
+            "message": self._message(language, step),
+            "checkin_data": self.checkin_data,
+            "success": step == "checkin_success"
+        }
+
+    def _checkin_payload(self) -> Dict[str, Any]:
+        """Flatten collected step inputs into the check-in API payload"""
+        fields: Dict[str, Any] = {}
+        for step_data in self.checkin_data.values():
+            if isinstance(step_data, dict):
+                fields.update(step_data)
+        return {
+            "pnr": str(fields.get("pnr", "")).strip().upper(),
+            "last_name": fields.get("last_name") or fields.get("lastname"),
+            "mobile": fields.get("mobile"),
+            "email": fields.get("email"),
+            "seat_consent": fields.get("consent", fields.get("seat_consent"))
+        }
+
+    async def _checkin_inline(self, language: str) -> Dict[str, Any]:
+        """Without a job queue (standalone use), check in against the mock service in-request"""
+        payload = self._checkin_payload()
+        if not all(payload.get(field) for field in ("pnr", "last_name")):
+            return self._step_response("checkin_error", language)
+        try:
+            result = await MockCheckinService(latency_seconds=0).check_in(payload)
+        except CheckinServiceError as e:
+            response = self._step_response("checkin_error", language)
+            response["error"] = str(e)
+            return response
+        response = self._step_response("checkin_success", language)
+        response["checkin_result"] = result
+        return response
@@ -0,0 +1,397 @@
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, List
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+
+class CheckinServiceError(Exception):
+    """
+    Raised by a check-in service.
+    - `retryable` marks transient failures
+    - `code` is a short, PII-free reason that is safe to audit
+    """
+
+    def __init__(self, message: str, retryable: bool = True, code: str = "service_error"):
+        super().__init__(message)
+        self.retryable = retryable
+        self.code = code
+
+
+class MockCheckinService:
+    """
+    Local stand-in for the airline check-in API.
+    - Simulates multi-second latency and transient failures
+    - Rejects PNRs starting with "X" as a permanent failure
+    """
+
+    def __init__(self, latency_seconds: float = 2.0, failure_rate: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    async def check_in(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(self.latency_seconds)
+
+        pnr = payload.get("pnr", "")
+        if pnr.startswith("X"):
+            raise CheckinServiceError("PNR not found", retryable=False, code="pnr_not_found")
+        if random.random() < self.failure_rate:
+            raise CheckinServiceError("Check-in service temporarily unavailable", code="unavailable")
+
+        return {
+            "pnr": pnr,
+            "status": "scheduled",
+            "boarding_pass_email": payload.get("email")
+        }
+
+
+class HttpCheckinService:
+    """Calls the airline check-in API at CHECKIN_API_URL"""
+
+    def __init__(self, api_url: str, api_key: Optional[str] = None, timeout: float = 30.0):
+        self.api_url = api_url
+        self.headers = {"Content-Type": "application/json"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.timeout = timeout
+
+    async def check_in(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                response = await client.post(self.api_url, headers=self.headers, json=payload)
+        except httpx.HTTPError as e:
+            raise CheckinServiceError(f"Check-in request failed: {type(e).__name__}", code="request_failed")
+
+        if response.status_code >= 500 or response.status_code == 429:
+            raise CheckinServiceError(f"Check-in API error: {response.status_code}", code=f"http_{response.status_code}")
+        # The response body may echo passenger data, so only the status is kept
+        if response.status_code != 200:
+            raise CheckinServiceError(f"Check-in rejected: {response.status_code}", retryable=False,
+                                      code=f"http_{response.status_code}")
+        return response.json()
+
+
+class InProcessBroker:
+    """Bounded asyncio queue of job ids; jobs live in this process only"""
+
+    def __init__(self, maxsize: int = 1000):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.index: Dict[str, str] = {}
+
+    async def put(self, job_id: str) -> bool:
+        try:
+            self.queue.put_nowait(job_id)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+    def qsize(self) -> int:
+        return self.queue.qsize()
+
+    async def save_job(self, job: Dict[str, Any]) -> None:
+        pass
+
+    async def load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    async def lookup_index(self, key: str) -> Optional[str]:
+        return self.index.get(key)
+
+    async def claim_index(self, key: str, expected: Optional[str], job_id: str) -> Optional[str]:
+        """Point `key` at `job_id` if it still points at `expected`; returns the current holder otherwise"""
+        current = self.index.get(key)
+        if current is not None and current != expected:
+            return current
+        self.index[key] = job_id
+        return None
+
+    async def release_index(self, key: str, job_id: str) -> None:
+        if self.index.get(key) == job_id:
+            del self.index[key]
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBroker:
+    """
+    Redis-backed job list, job store and (PNR, last name) index so several
+    workers/processes share jobs and idempotency. Requires the optional `redis` package.
+    """
+
+    # Compare-and-set: claim KEYS[1] when unset or still holding ARGV[1]
+    CLAIM_SCRIPT = """
+    local current = redis.call('GET', KEYS[1])
+    if current and current ~= ARGV[1] then
+        return current
+    end
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+    return false
+    """
+    RELEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url: str, maxsize: int = 1000, prefix: str = "checkin"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ImportError("RedisBroker requires the 'redis' package: pip install redis")
+        self.redis = redis.from_url(url, decode_responses=True)
+        self.maxsize = maxsize
+        self.queue_key = f"{prefix}:queue"
+        self.job_prefix = f"{prefix}:job:"
+        self.index_prefix = f"{prefix}:index:"
+        self.ttl = 86400
+
+    async def put(self, job_id: str) -> bool:
+        if await self.redis.llen(self.queue_key) >= self.maxsize:
+            return False
+        await self.redis.lpush(self.queue_key, job_id)
+        return True
+
+    async def get(self) -> str:
+        _, job_id = await self.redis.brpop(self.queue_key)
+        return job_id
+
+    def qsize(self) -> int:
+        return -1
+
+    async def save_job(self, job: Dict[str, Any]) -> None:
+        await self.redis.set(self.job_prefix + job["job_id"], json.dumps(job), ex=self.ttl)
+
+    async def load_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.redis.get(self.job_prefix + job_id)
+        return json.loads(data) if data else None
+
+    async def lookup_index(self, key: str) -> Optional[str]:
+        return await self.redis.get(self.index_prefix + key)
+
+    async def claim_index(self, key: str, expected: Optional[str], job_id: str) -> Optional[str]:
+        current = await self.redis.eval(self.CLAIM_SCRIPT, 1, self.index_prefix + key, expected or "", job_id, self.ttl)
+        return current or None
+
+    async def release_index(self, key: str, job_id: str) -> None:
+        await self.redis.eval(self.RELEASE_SCRIPT, 1, self.index_prefix + key, job_id)
+
+    async def close(self) -> None:
+        await self.redis.close()
+
+
+class CheckinJobQueue:
+    """
+    Bounded worker pool for check-in requests.
+    - Jobs are idempotent per (PNR, last name): resubmitting returns the existing
+      job, but a session that only knows the PNR never sees another passenger's job.
+      The index lives in the broker, so it is shared when the broker is Redis
+    - Transient failures are retried with exponential backoff
+    - Callers poll `get_job` or `wait_for_job` for the result
+    - Finished jobs are forgotten `job_ttl` seconds after they finish
+    """
+
+    def __init__(
+        self,
+        service,
+        broker=None,
+        workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        job_ttl: float = 3600,
+        poll_interval: float = 0.25
+    ):
+        self.service = service
+        self.broker = broker or InProcessBroker()
+        self.worker_count = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.job_ttl = job_ttl
+        self.poll_interval = poll_interval
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        # (finished_at, job_id, key) in finishing order, so expiry only looks at the head
+        self._finished: deque = deque()
+        self._workers: List[asyncio.Task] = []
+
+    @classmethod
+    def from_env(cls) -> "CheckinJobQueue":
+        """Build the queue from CHECKIN_* environment variables"""
+        api_url = os.getenv("CHECKIN_API_URL")
+        if api_url:
+            service = HttpCheckinService(api_url, os.getenv("CHECKIN_API_KEY"))
+        else:
+            service = MockCheckinService(latency_seconds=float(os.getenv("CHECKIN_MOCK_LATENCY", "2.0")))
+
+        maxsize = int(os.getenv("CHECKIN_QUEUE_SIZE", "1000"))
+        broker_url = os.getenv("CHECKIN_BROKER_URL")
+        broker = RedisBroker(broker_url, maxsize=maxsize) if broker_url else InProcessBroker(maxsize=maxsize)
+
+        return cls(
+            service,
+            broker=broker,
+            workers=int(os.getenv("CHECKIN_WORKERS", "4")),
+            max_retries=int(os.getenv("CHECKIN_MAX_RETRIES", "3")),
+            job_ttl=float(os.getenv("CHECKIN_JOB_TTL", "3600"))
+        )
+
+    def start(self) -> None:
+        """Start worker tasks on the running event loop"""
+        if self._workers:
+            return
+        for i in range(self.worker_count):
+            self._workers.append(asyncio.create_task(self._worker(i)))
+
+    async def stop(self) -> None:
+        """Cancel workers and release the broker"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.broker.close()
+
+    async def submit(self, pnr: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Enqueue a check-in for `pnr` and the last name in `payload`.
+
+        Returns:
+            The job record (existing one if this PNR and last name are already
+            pending, running or succeeded), or None when the queue is full
+        """
+        await self._expire_finished()
+        pnr = pnr.strip().upper()
+        key = self._job_key(pnr, payload)
+        existing_id = await self.broker.lookup_index(key)
+        if existing_id:
+            existing = await self.get_job(existing_id)
+            if existing and existing["status"] != FAILED:
+                return existing
+
+        job = {
+            "job_id": str(uuid.uuid4()),
+            "pnr": pnr,
+            "payload": payload,
+            "status": PENDING,
+            "attempts": 0,
+            "result": None,
+            "error": None,
+            "error_code": None,
+            "created_at": time.time(),
+            "updated_at": time.time()
+        }
+        # Another worker may have claimed the key since the lookup; use its job then
+        holder = await self.broker.claim_index(key, existing_id, job["job_id"])
+        if holder:
+            return await self.get_job(holder)
+
+        self.jobs[job["job_id"]] = job
+        self._events[job["job_id"]] = asyncio.Event()
+        await self.broker.save_job(job)
+
+        if not await self.broker.put(job["job_id"]):
+            del self.jobs[job["job_id"]]
+            del self._events[job["job_id"]]
+            await self.broker.release_index(key, job["job_id"])
+            return None
+        return job
+
+    @staticmethod
+    def _job_key(pnr: str, payload: Dict[str, Any]) -> str:
+        return f'{pnr}:{str(payload.get("last_name") or "").strip().casefold()}'
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current job record, from the broker store when it has one"""
+        return await self.broker.load_job(job_id) or self.jobs.get(job_id)
+
+    async def wait_for_job(self, job_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait up to `timeout` seconds for a job to finish, then return its record.
+        Polls the job record, since another process may be running the job; a local
+        event only cuts the wait short when this process runs it.
+        """
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            job = await self.get_job(job_id)
+            remaining = deadline - time.monotonic()
+            if not job or job["status"] in FINISHED_STATES or remaining <= 0:
+                return job
+            event = self._events.get(job_id)
+            try:
+                await asyncio.wait_for(
+                    event.wait() if event else asyncio.sleep(self.poll_interval),
+                    min(self.poll_interval, remaining)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        counts = {PENDING: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+        for job in self.jobs.values():
+            counts[job["status"]] += 1
+        return {"workers": len(self._workers), "queued": self.broker.qsize(), "jobs": counts}
+
+    async def _update(self, job: Dict[str, Any], **changes) -> None:
+        job.update(changes, updated_at=time.time())
+        await self.broker.save_job(job)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self.broker.get()
+            job = await self.get_job(job_id)
+            if not job or job["status"] in FINISHED_STATES:
+                continue
+            self.jobs[job_id] = job
+            try:
+                await self._run(job)
+            except Exception as e:
+                logger.error(f"Check-in worker {index} error for job {job['job_id']}: {type(e).__name__}")
+                await self._update(job, status=FAILED, error="Check-in failed", error_code=type(e).__name__)
+            event = self._events.get(job_id)
+            if event:
+                event.set()
+            self._finished.append((time.time(), job_id, self._job_key(job["pnr"], job["payload"])))
+            await self._expire_finished()
+
+    async def _expire_finished(self) -> None:
+        """Drop finished jobs older than `job_ttl` along with their event and index entries"""
+        cutoff = time.time() - self.job_ttl
+        while self._finished and self._finished[0][0] < cutoff:
+            _, job_id, key = self._finished.popleft()
+            self.jobs.pop(job_id, None)
+            self._events.pop(job_id, None)
+            await self.broker.release_index(key, job_id)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        while True:
+            await self._update(job, status=RUNNING, attempts=job["attempts"] + 1)
+            try:
+                result = await self.service.check_in(job["payload"])
+                await self._update(job, status=SUCCEEDED, result=result, error=None)
+                return
+            except CheckinServiceError as e:
+                if not e.retryable or job["attempts"] > self.max_retries:
+                    await self._update(job, status=FAILED, error=str(e), error_code=e.code)
+                    return
+                logger.error(f"Check-in attempt {job['attempts']} failed for job {job['job_id']}: {e.code}")
+                await asyncio.sleep(self.retry_backoff * 2 ** (job["attempts"] - 1))
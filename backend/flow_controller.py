@@ -1,6 +1,9 @@
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from avatar_engine import AvatarEngine
+from validators import booking_validator
+from language_catalog import catalogs
+from runtime_config import load_flow_tables
 
 
 class FlowController:
@@ -11,57 +14,32 @@ class FlowController:
     - Returns correct messages and videos for each step
     """
 
-    def __init__(self, uid: str, language: str = "en", avatar_engine=None):
+    def __init__(self, uid: str, language: str = "en", avatar_engine=None, search_cache=None, airport_index=None,
+                 audit_log=None, config_store=None):
         self.uid = uid
         self.language = language
         self.avatar_engine = avatar_engine
+        self.search_cache = search_cache
+        self.airport_index = airport_index
+        self.audit_log = audit_log
+        self.config_store = config_store
         self.current_step = None
         self.booking_data = {}
 
-        # Messages for each step in different languages
-        self.messages = {
-            "en": {
-                "welcome": "Hello! I'll help you book your flight. Let's get started!",
-                "origin_selection": "Great! Let's start by selecting your departure city. Where would you like to fly from?",
-                "destination_selection": "Perfect! Now, where would you like to fly to?",
-                "date_selection": "Excellent! When would you like to travel? Please select your preferred date.",
-                "passenger_selection": "Now let's select the number of passengers. How many people will be traveling?",
-                "passenger_details": "Now I need details for all passengers. Please provide information for each traveler.",
-                "flight_search": "Searching for flights based on your preferences...",
-                "flight_selection": "Here are the available flights. Please select your preferred option.",
-                "contact_details": "Please provide contact details for booking.",
-                "review_booking": "Please review your booking details before proceeding to payment.",
-                "payment": "Redirecting to secure payment gateway..."
-            },
-            "hi": {
-                "welcome": "नमस्ते! मैं आपकी फ्लाइट बुकिंग में मदद करूंगा। चलिए शुरुआत करते हैं!",
-                "origin_selection": "बहुत अच्छा! चलिए अपने प्रस्थान शहर को चुनकर शुरुआत करते हैं। आप कहाँ से उड़ान भरना चाहते हैं?",
-                "destination_selection": "बिल्कुल! अब आप कहाँ जाना चाहते हैं?",
-                "date_selection": "शानदार! आप कब यात्रा करना चाहते हैं? अपनी पसंदीदा तारीख चुनें।",
-                "passenger_selection": "अब आइए यात्रियों की संख्या चुनें। कितने लोग यात्रा करेंगे?",
-                "passenger_details": "अब मुझे सभी यात्रियों का विवरण चाहिए। कृपया प्रत्येक यात्री की जानकारी प्रदान करें।",
-                "flight_search": "आपकी पसंद के अनुसार उड़ानों की खोज जारी है...",
-                "flight_selection": "यहाँ उपलब्ध उड़ानें हैं। अपनी पसंदीदा उड़ान चुनें।",
-                "contact_details": "बुकिंग के लिए संपर्क विवरण प्रदान करें।",
-                "review_booking": "भुगतान के लिए आगे बढ़ने से पहले अपने बुकिंग विवरण की समीक्षा करें।",
-                "payment": "सुरक्षित भुगतान गेटवे पर पुनर्निर्देशित किया जा रहा है..."
-            }
-        }
+        # Flow sequence - which step comes after which (configs/flow_config.json)
+        if config_store:
+            self._use_current_config()
+        else:
+            self.step_flow = load_flow_tables()["booking"]
+            self.catalogs = catalogs
 
-        # Define the flow sequence - which step comes after which
-        self.step_flow = {
-            "welcome": "origin_selection",
-            "origin_selection": "destination_selection",
-            "destination_selection": "date_selection",
-            "date_selection": "passenger_selection",
-            "passenger_selection": "passenger_details",
-            "passenger_details": "flight_search",
-            "flight_search": "flight_selection",
-            "flight_selection": "contact_details",
-            "contact_details": "review_booking",
-            "review_booking": "payment",
-            "payment": "complete"
-        }
+    def _use_current_config(self) -> None:
+        """Adopt the live config snapshot; called once per step so a step never mixes versions"""
+        if self.config_store:
+            config = self.config_store.current
+            self.step_flow = config.flows["booking"]
+            self.catalogs = config.catalogs
+            self.avatar_engine = config.avatar_engine
 
     async def start_avatar_flow(self, query: str, language: str) -> Dict[str, Any]:
         """
@@ -69,18 +47,21 @@ class FlowController:
         
         Returns the welcome step with video and message.
         """
+        self._use_current_config()
         self.language = language
         self.current_step = "welcome"
-        
+        self._audit("flow_started", language=language)
+
         video_url = self.avatar_engine.get_video_url("welcome", language)
-        message = self.messages.get(language, self.messages["en"]).get("welcome")
+        message = self._message(language, "welcome")
 
         return {
             "type": "avatar_flow",
             "step": "welcome",
             "avatar_video": video_url,
+            "avatar_segment": self.avatar_engine.get_bundle_segment("welcome", language),
             "message": message,
-            "next_step": "origin_selection",
+            "next_step": self.step_flow.get("welcome", "complete"),
             "uid": self.uid,
             "show_input": True
         }
@@ -94,19 +75,34 @@ class FlowController:
         """
         Process a booking step and return the current step data.
         """
+        self._use_current_config()
         self.language = language
-        
+
+        # Validate input before it reaches the flight search
+        validation_error = self._validate_input(step, user_input, language)
+        if validation_error:
+            self._audit("validation_error", step=step, field=validation_error.get("field"))
+            return validation_error
+
+        # Get the NEXT step to show
+        next_step = self.step_flow.get(step, "complete")
+
+        # Never search without a complete route
+        if next_step == "flight_search":
+            missing = self._missing_search_field(user_input)
+            if missing:
+                self._audit("validation_error", step=step, field=missing)
+                return self._validation_error(step, self._message(language, "missing_field"), language, field=missing)
+
         # Store user input
         if user_input:
             self.booking_data[step] = user_input
 
-        # Get the NEXT step to show
-        next_step = self.step_flow.get(step, "complete")
         self.current_step = next_step
+        self._audit("step", step=step, next_step=next_step, language=language, data=user_input or {})
 
         # Get message and video for the NEXT step
-        message_dict = self.messages.get(language, self.messages["en"])
-        message = message_dict.get(next_step, f"Processing {next_step}")
+        message = self._message(language, next_step, f"Processing {next_step}")
         video_url = self.avatar_engine.get_video_url(next_step, language)
 
         response = {
@@ -114,6 +110,7 @@ class FlowController:
             "step": next_step,
             "next_step": self.step_flow.get(next_step, "complete"),
             "avatar_video": video_url,
+            "avatar_segment": self.avatar_engine.get_bundle_segment(next_step, language),
             "message": message,
             "booking_data": self.booking_data
         }
@@ -121,7 +118,7 @@ class FlowController:
         # Special handling for flight search
         if next_step == "flight_search":
             # Auto-show flight results
-            flights = self._get_dummy_flights()
+            flights = self._search_flights()
             response["flights"] = flights
             response["type"] = "flight_results"
             response["message"] = f"Found {len(flights)} flights"
@@ -137,16 +134,40 @@ class FlowController:
             response["type"] = "payment"
             response["message"] = "Redirecting to secure payment gateway..."
             response["next_step"] = "complete"
+            self._audit("payment_handoff", booking=self.booking_data)
         
         # Complete step - end of flow
         if next_step == "complete":
             response["type"] = "complete"
             response["message"] = "Processing complete"
             response["avatar_video"] = None
+            response["avatar_segment"] = None
             response["next_step"] = None
 
         return response
 
+    def _audit(self, event: str, **fields) -> None:
+        if self.audit_log:
+            self.audit_log.record("booking", event, self.uid, **fields)
+
+    def _message(self, language: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Localized booking message from the compiled catalogs"""
+        return self.catalogs.get(language, f"booking.{key}", default)
+
+    def export_state(self) -> Dict[str, Any]:
+        """Minimal state needed to resume this flow (used by stateless mode)"""
+        return {
+            "current_step": self.current_step,
+            "language": self.language,
+            "data": self.booking_data
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Resume from a state produced by export_state"""
+        self.current_step = state.get("current_step")
+        self.language = state.get("language") or self.language
+        self.booking_data = dict(state.get("data") or {})
+
     def get_booking_summary(self) -> Dict[str, Any]:
         """Get current booking summary"""
         return {
@@ -162,6 +183,84 @@ class FlowController:
             return int((steps.index(self.current_step) + 1) / len(steps) * 100)
         return 0
 
+    def _validate_input(
+        self,
+        step: str,
+        user_input: Dict[str, Any],
+        language: str
+    ) -> Optional[Dict[str, Any]]:
+        """Run field validators and city checks; return an error response if invalid"""
+        invalid = booking_validator.validate(step, user_input)
+        if invalid:
+            field, error = invalid
+            message = self._message(language, error) or self._message(language, "missing_field")
+            return self._validation_error(step, message, language, field=field)
+        return self._validate_cities(step, user_input, language)
+
+    def _validate_cities(
+        self,
+        step: str,
+        user_input: Dict[str, Any],
+        language: str
+    ) -> Optional[Dict[str, Any]]:
+        """Resolve origin/destination input to airports; return an error response if invalid"""
+        if not self.airport_index or not user_input:
+            return None
+
+        for field in ("origin", "destination"):
+            if field not in user_input:
+                continue
+            airport = self.airport_index.resolve(user_input[field])
+            if not airport:
+                suggestions = self.airport_index.autocomplete(user_input[field], language=language)
+                return self._validation_error(step, self._message(language, "invalid_city"), language, suggestions=suggestions)
+            user_input[f"{field}_code"] = airport["code"]
+
+        origin_code = user_input.get("origin_code") or self._find_booking_field("origin_code")
+        destination_code = user_input.get("destination_code") or self._find_booking_field("destination_code")
+        if "destination_code" in user_input and origin_code == destination_code:
+            return self._validation_error(step, self._message(language, "same_city"), language)
+        return None
+
+    def _validation_error(self, step: str, message: str, language: str, **extra) -> Dict[str, Any]:
+        response = {
+            "type": "validation_error",
+            "step": step,
+            "message": message,
+            "avatar_video": self.avatar_engine.get_video_url(step, language),
+            "avatar_segment": self.avatar_engine.get_bundle_segment(step, language)
+        }
+        response.update(extra)
+        return response
+
+    def _find_booking_field(self, field: str) -> Any:
+        """Find a collected field regardless of which step stored it"""
+        for step_data in self.booking_data.values():
+            if isinstance(step_data, dict) and field in step_data:
+                return step_data[field]
+        return None
+
+    def _missing_search_field(self, user_input: Optional[Dict[str, Any]]) -> Optional[str]:
+        """First search field not collected yet, counting the input of the current step"""
+        user_input = user_input if isinstance(user_input, dict) else {}
+        for names in (("origin", "origin_code"), ("destination", "destination_code"), ("date",), ("passengers",)):
+            if not any(user_input.get(name) or self._find_booking_field(name) for name in names):
+                return names[0]
+        return None
+
+    def _search_flights(self) -> list:
+        """Search flights for the collected route, served from the shared cache when possible"""
+        if not self.search_cache:
+            return self._get_dummy_flights()
+
+        key = self.search_cache.make_key(
+            self._find_booking_field("origin_code") or self._find_booking_field("origin"),
+            self._find_booking_field("destination_code") or self._find_booking_field("destination"),
+            self._find_booking_field("date"),
+            self._find_booking_field("passengers")
+        )
+        return self.search_cache.get_or_compute(key, self._get_dummy_flights)
+
     def _get_dummy_flights(self) -> list:
         """Return dummy flight data for demonstration"""
         return [
@@ -0,0 +1,132 @@
+import os
+import hmac
+import json
+import time
+import zlib
+import base64
+import hashlib
+from typing import Dict, Any, Optional
+
+TOKEN_VERSION = 1
+FLAG_COMPRESSED = 0x01
+FLAG_ENCRYPTED = 0x02
+MAC_SIZE = 16
+NONCE_SIZE = 12
+
+
+class InvalidStateToken(Exception):
+    """Raised when a flow-state token is malformed, tampered with or expired"""
+
+
+class FlowStateCodec:
+    """
+    Encodes flow state into compact signed tokens for stateless mode.
+
+    Token layout (base64url, no padding):
+        version (1 byte) | flags (1 byte) | payload | HMAC-SHA256 truncated to 16 bytes
+
+    The payload is a positional JSON array, zlib-compressed when that is smaller,
+    and AES-GCM encrypted when an encryption key is configured (requires the
+    optional `cryptography` package).
+    """
+
+    def __init__(self, secret: bytes, encryption_key: Optional[bytes] = None, ttl_seconds: int = 7200):
+        self.secret = secret
+        self.ttl_seconds = ttl_seconds
+        self.aead = None
+        if encryption_key:
+            try:
+                from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+            except ImportError:
+                raise ImportError("Encrypted flow-state tokens require the 'cryptography' package: pip install cryptography")
+            self.aead = AESGCM(hashlib.sha256(encryption_key).digest())
+
+    @classmethod
+    def from_env(cls) -> "FlowStateCodec":
+        """Build the codec from FLOW_STATE_* environment variables"""
+        secret = os.getenv("FLOW_STATE_SECRET")
+        if not secret:
+            # A per-worker random secret would make every token fail on other workers
+            raise ValueError("FLOW_STATE_SECRET must be set (the same value on every worker) in stateless mode")
+        encryption_key = os.getenv("FLOW_STATE_ENCRYPTION_KEY")
+        return cls(
+            secret.encode(),
+            encryption_key.encode() if encryption_key else None,
+            ttl_seconds=int(os.getenv("FLOW_STATE_TTL", "7200"))
+        )
+
+    def encode(self, flow: str, uid: str, state: Dict[str, Any]) -> str:
+        """Serialize controller state (see export_state) into a token"""
+        record = [
+            flow,
+            uid,
+            state.get("current_step"),
+            state.get("language"),
+            state.get("data", {}),
+            state.get("job_id"),
+            int(time.time()) + self.ttl_seconds
+        ]
+        payload = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode()
+
+        flags = 0
+        compressed = zlib.compress(payload, 9)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_COMPRESSED
+
+        header = bytes([TOKEN_VERSION, flags | (FLAG_ENCRYPTED if self.aead else 0)])
+        if self.aead:
+            nonce = os.urandom(NONCE_SIZE)
+            payload = nonce + self.aead.encrypt(nonce, payload, header)
+
+        body = header + payload
+        mac = hmac.new(self.secret, body, hashlib.sha256).digest()[:MAC_SIZE]
+        return base64.urlsafe_b64encode(body + mac).rstrip(b"=").decode()
+
+    def decode(self, token: str, flow: str, uid: str) -> Dict[str, Any]:
+        """
+        Verify and deserialize a token for `flow` and `uid`.
+
+        Returns:
+            State dict accepted by the controllers' restore_state
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (ValueError, TypeError):
+            raise InvalidStateToken("Malformed state token")
+        if len(raw) < 2 + MAC_SIZE:
+            raise InvalidStateToken("Malformed state token")
+
+        body, mac = raw[:-MAC_SIZE], raw[-MAC_SIZE:]
+        expected = hmac.new(self.secret, body, hashlib.sha256).digest()[:MAC_SIZE]
+        if not hmac.compare_digest(mac, expected):
+            raise InvalidStateToken("State token signature mismatch")
+
+        version, flags, payload = body[0], body[1], body[2:]
+        if version != TOKEN_VERSION:
+            raise InvalidStateToken("Unsupported state token version")
+
+        try:
+            if flags & FLAG_ENCRYPTED:
+                if not self.aead:
+                    raise InvalidStateToken("Encrypted state token but no encryption key configured")
+                payload = self.aead.decrypt(payload[:NONCE_SIZE], payload[NONCE_SIZE:], body[:2])
+            if flags & FLAG_COMPRESSED:
+                payload = zlib.decompress(payload)
+            token_flow, token_uid, current_step, language, data, job_id, expires_at = json.loads(payload)
+        except InvalidStateToken:
+            raise
+        except Exception:
+            raise InvalidStateToken("Corrupt state token")
+
+        if token_flow != flow or token_uid != uid:
+            raise InvalidStateToken("State token does not belong to this flow")
+        if expires_at < time.time():
+            raise InvalidStateToken("State token expired")
+
+        return {
+            "current_step": current_step,
+            "language": language,
+            "data": data,
+            "job_id": job_id
+        }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Compiled, memory-mapped message catalogs.
+
+Sources are flat JSON files (configs/catalogs/<language>.json) mapping message
+names such as "booking.welcome" to text. They are compiled into a directory
+named after a fingerprint of the sources, so a changed source set never
+overwrites files an older LanguageCatalogs instance may still map:
+
+    compiled/<fingerprint>/index.json      message names in ID order (interned to integers)
+    compiled/<fingerprint>/<language>.cat  binary catalog, one per language
+
+Catalog layout (little-endian):
+    magic b"LCAT" | version u16 | count u32 | (count + 1) u32 offsets | UTF-8 blob
+
+A message with equal start/end offsets is missing in that language. Each
+language file is memory-mapped the first time a message in it is requested,
+so unused languages cost nothing.
+
+Run this file directly to compile the catalogs ahead of deployment.
+"""
+import os
+import glob
+import json
+import mmap
+import shutil
+import struct
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+CATALOG_DIR = os.path.join(os.path.dirname(__file__), "..", "configs", "catalogs")
+COMPILED_DIR = os.path.join(CATALOG_DIR, "compiled")
+
+MAGIC = b"LCAT"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+OFFSET = struct.Struct("<I")
+OFFSET_PAIR = struct.Struct("<II")
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def compile_catalogs(source_dir: str = CATALOG_DIR, compiled_dir: str = COMPILED_DIR) -> List[str]:
+    """
+    Compile every source catalog in `source_dir`.
+
+    Returns:
+        Compiled language codes
+    """
+    sources = {}
+    for path in sorted(glob.glob(os.path.join(source_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            sources[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+
+    ids = sorted({name for messages in sources.values() for name in messages})
+    os.makedirs(compiled_dir, exist_ok=True)
+
+    for language, messages in sources.items():
+        offsets, blob = [0], bytearray()
+        for name in ids:
+            blob += messages.get(name, "").encode("utf-8")
+            offsets.append(len(blob))
+        data = HEADER.pack(MAGIC, VERSION, len(ids))
+        data += b"".join(OFFSET.pack(offset) for offset in offsets) + bytes(blob)
+        _write_atomic(os.path.join(compiled_dir, f"{language}.cat"), data)
+
+    # Written last: a fresh index marks the compiled set as complete
+    index = {"version": VERSION, "ids": ids, "languages": list(sources)}
+    _write_atomic(os.path.join(compiled_dir, "index.json"), json.dumps(index, ensure_ascii=False).encode("utf-8"))
+    return list(sources)
+
+
+def source_fingerprint(source_dir: str = CATALOG_DIR) -> str:
+    """Cheap fingerprint of the source catalogs (names, sizes and mtimes)"""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(source_dir, "*.json"))):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def prune_compiled(compiled_dir: str = COMPILED_DIR, keep: str = "") -> None:
+    """Remove compiled sets other than `keep` (offline only; running workers may map them)"""
+    for path in glob.glob(os.path.join(compiled_dir, "*")):
+        if os.path.isdir(path) and os.path.basename(path) != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class CompiledCatalog:
+    """One memory-mapped language catalog; lookups are by integer message ID"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"Not a compiled catalog: {path}")
+        self._offsets_at = HEADER.size
+        self._blob_at = HEADER.size + (self.count + 1) * OFFSET.size
+
+    def get(self, message_id: int) -> Optional[str]:
+        if not 0 <= message_id < self.count:
+            return None
+        start, end = OFFSET_PAIR.unpack_from(self._map, self._offsets_at + message_id * OFFSET.size)
+        if start == end:
+            return None
+        return self._map[self._blob_at + start:self._blob_at + end].decode("utf-8")
+
+    def close(self) -> None:
+        self._map.close()
+
+
+class LanguageCatalogs:
+    """
+    Lazily loaded message catalogs for every language.
+    - Compiles sources on first use if no compiled set matches their fingerprint
+    - Maps each language file on first lookup in that language
+    - Falls back to the default language for missing messages
+    """
+
+    def __init__(self, source_dir: str = CATALOG_DIR, compiled_dir: str = COMPILED_DIR, default_language: str = "en"):
+        self.source_dir = source_dir
+        self.compiled_dir = compiled_dir
+        self.default_language = default_language
+        self.ids: Optional[Dict[str, int]] = None
+        self.languages: List[str] = []
+        self.version_dir: Optional[str] = None
+        self._catalogs: Dict[str, Optional[CompiledCatalog]] = {}
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> None:
+        with self._lock:
+            if self.ids is not None:
+                return
+            version_dir = os.path.join(self.compiled_dir, source_fingerprint(self.source_dir))
+            if not os.path.exists(os.path.join(version_dir, "index.json")):
+                compile_catalogs(self.source_dir, version_dir)
+            with open(os.path.join(version_dir, "index.json"), encoding="utf-8") as f:
+                index = json.load(f)
+            self.version_dir = version_dir
+            self.languages = index["languages"]
+            self.ids = {name: i for i, name in enumerate(index["ids"])}
+
+    def load(self) -> None:
+        """Compile if needed and read the index now instead of on the first lookup"""
+        if self.ids is None:
+            self._load_index()
+
+    def message_id(self, name: str) -> Optional[int]:
+        """Interned integer ID for a message name"""
+        if self.ids is None:
+            self._load_index()
+        return self.ids.get(name)
+
+    def catalog(self, language: str) -> Optional[CompiledCatalog]:
+        """Compiled catalog for `language`, mapped on first use; None if not available"""
+        catalog = self._catalogs.get(language)
+        if catalog is not None or language in self._catalogs:
+            return catalog
+
+        if self.ids is None:
+            self._load_index()
+        with self._lock:
+            if language not in self._catalogs:
+                path = os.path.join(self.version_dir, f"{language}.cat")
+                self._catalogs[language] = CompiledCatalog(path) if language in self.languages else None
+            return self._catalogs[language]
+
+    def get(self, language: str, name: str, default: Optional[str] = None, fallback: bool = True) -> Optional[str]:
+        """
+        Look up a message.
+
+        Args:
+            language: Language code
+            name: Message name, e.g. "booking.welcome"
+            default: Returned when the message is missing
+            fallback: Try the default language when `language` lacks the message
+        """
+        message_id = self.message_id(name)
+        if message_id is None:
+            return default
+
+        catalog = self.catalog(language)
+        message = catalog.get(message_id) if catalog else None
+        if message is None and fallback and language != self.default_language:
+            catalog = self.catalog(self.default_language)
+            message = catalog.get(message_id) if catalog else None
+        return default if message is None else message
+
+    def loaded_languages(self) -> List[str]:
+        return [language for language, catalog in self._catalogs.items() if catalog]
+
+    def close(self) -> None:
+        with self._lock:
+            for catalog in self._catalogs.values():
+                if catalog:
+                    catalog.close()
+            self._catalogs = {}
+
+
+catalogs = LanguageCatalogs()
+
+
+if __name__ == "__main__":
+    fingerprint = source_fingerprint()
+    compiled = compile_catalogs(compiled_dir=os.path.join(COMPILED_DIR, fingerprint))
+    prune_compiled(keep=fingerprint)
+    print(f"✅ Compiled catalogs: {', '.join(compiled)} -> {os.path.join(COMPILED_DIR, fingerprint)}")
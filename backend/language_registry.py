@@ -0,0 +1,69 @@
+import os
+import json
+from typing import Dict, Any, List, Optional, Tuple
+
+DEFAULT_LANGUAGES_PATH = os.path.join(os.path.dirname(__file__), "..", "configs", "languages.json")
+
+
+class LanguageRegistry:
+    """
+    Single source of truth for supported languages.
+    - Video folders and filename suffixes for AvatarEngine
+    - Sarvam language codes
+    - Chatbot trigger vocabularies
+    Languages without their own videos set `video_language` to borrow another's.
+    """
+
+    def __init__(self, languages: Dict[str, Dict[str, Any]], default: str = "en"):
+        if default not in languages:
+            raise ValueError(f"Default language '{default}' is not registered")
+        self.languages = languages
+        self.default = default
+
+        # Trigger vocabularies across all languages, built once
+        self.avatar_triggers: Tuple[str, ...] = self._collect("avatar_triggers")
+        self.checkin_triggers: Tuple[str, ...] = self._collect("checkin_triggers")
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_LANGUAGES_PATH) -> "LanguageRegistry":
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config["languages"], config.get("default", "en"))
+
+    def _collect(self, field: str) -> Tuple[str, ...]:
+        seen = {}
+        for config in self.languages.values():
+            for trigger in config.get(field, []):
+                seen.setdefault(trigger.lower().strip(), None)
+        return tuple(seen)
+
+    def codes(self) -> List[str]:
+        return list(self.languages)
+
+    def is_supported(self, language: str) -> bool:
+        return language in self.languages
+
+    def get(self, language: str) -> Dict[str, Any]:
+        """Language config, falling back to the default language"""
+        return self.languages.get(language) or self.languages[self.default]
+
+    def video_config(self, language: str) -> Dict[str, Any]:
+        """Config of the language whose videos are played for `language`"""
+        config = self.get(language)
+        if "video_folder" not in config:
+            config = self.get(config.get("video_language", self.default))
+        return config
+
+    def sarvam_code(self, language: str, default: Optional[str] = None) -> Optional[str]:
+        config = self.languages.get(language)
+        return config.get("sarvam_code", default) if config else default
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Public summary for clients (language pickers)"""
+        return [
+            {"code": code, "name": config.get("name"), "native_name": config.get("native_name")}
+            for code, config in self.languages.items()
+        ]
+
+
+registry = LanguageRegistry.from_file()
@@ -1,22 +1,54 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 import uuid
 import os
+import hmac
+import asyncio
 from dotenv import load_dotenv
 
-from avatar_engine import AvatarEngine
 from flow_controller import FlowController
 from checkin_controller import CheckinController
 from chatbot_integration import ChatbotIntegration
+from search_cache import SearchCache
+from airport_index import AirportIndex
+from checkin_jobs import CheckinJobQueue
+from rate_limiter import RateLimiter, RateLimitMiddleware
+from flow_state import FlowStateCodec, InvalidStateToken
+from audit_log import AuditLog
+from profiler import SamplingProfiler, SlowRequestCapture, SlowRequestMiddleware, to_folded
+from runtime_config import ConfigStore
 
 # Load environment variables
 load_dotenv()
 
+# Stateless mode: flow state travels in signed tokens instead of the sessions dict
+STATELESS_MODE = os.getenv("STATELESS_MODE", "0") == "1"
+
 app = FastAPI(title="Vernacular Avatar Flight Booking", version="1.0.0")
 
+# Token bucket limits on /chat (per IP, per uid, global new sessions).
+# Added before CORS so 429 responses still carry CORS headers.
+rate_limiter = RateLimiter.from_env()
+app.add_middleware(
+    RateLimitMiddleware,
+    limiter=rate_limiter,
+    paths=("/chat",),
+    session_exists=lambda uid: STATELESS_MODE or uid in sessions,
+    # Number of proxies in front of the app that append to X-Forwarded-For (Render: one)
+    trusted_proxies=int(os.getenv("RATE_LIMIT_TRUST_PROXY", "1" if "RENDER" in os.environ else "0"))
+)
+
+# Stack-sample capture for slow /chat, /avatar-step and /checkin-step requests
+slow_requests = SlowRequestCapture(
+    threshold_ms=float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000")),
+    max_traces=int(os.getenv("SLOW_REQUEST_BUFFER", "50"))
+)
+app.add_middleware(SlowRequestMiddleware, capture=slow_requests)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -35,6 +67,7 @@ class StepRequest(BaseModel):
     step: str
     user_input: Dict[str, Any]
     language: str = "en"
+    state_token: Optional[str] = None
 
 # Global instances
 # Detect if running on Render and use the external URL
@@ -45,12 +78,12 @@ import socket
 if 'RENDER' in os.environ or 'RENDER_EXTERNAL_URL' in os.environ:
     # Running on Render - use the external URL
     render_url = os.environ.get('RENDER_EXTERNAL_URL', 'https://indigo-avatar-booking.onrender.com')
-    avatar_engine = AvatarEngine(base_ip=render_url)
+    avatar_base = render_url
     print(f"📹 Using Render for videos: {render_url}")
 elif os.getenv('NGROK_URL'):
     # Using ngrok for local development
     ngrok_url = os.getenv('NGROK_URL')
-    avatar_engine = AvatarEngine(base_ip=ngrok_url)
+    avatar_base = ngrok_url
     print(f"📹 Using ngrok for videos: {ngrok_url}")
 else:
     # Local development - use local IP
@@ -64,11 +97,70 @@ else:
         except:
             return "localhost"
     server_ip = get_local_ip()
-    avatar_engine = AvatarEngine(base_ip=server_ip)
+    avatar_base = server_ip
     print(f"📹 Using local IP for videos: {server_ip}")
 
+# Hot-reloadable flows, messages and video mappings, swapped atomically on reload
+config_store = ConfigStore.from_env(avatar_base)
+
 sessions = {}
 
+# Shared flight search cache - popular routes are served across sessions
+search_cache = SearchCache(
+    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", "300")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+)
+
+# Airport/city prefix index for autocomplete and origin/destination validation
+airport_index = AirportIndex.from_file()
+
+# Worker pool for airline check-in calls (mock service unless CHECKIN_API_URL is set)
+checkin_jobs = CheckinJobQueue.from_env()
+
+# Batched, non-blocking audit trail of flow transitions
+audit_log = AuditLog.from_env()
+
+flow_state_codec = FlowStateCodec.from_env() if STATELESS_MODE else None
+if STATELESS_MODE:
+    # Tokens carry only the job id; the job itself must be visible to every worker
+    if not os.getenv("CHECKIN_BROKER_URL"):
+        raise ValueError("STATELESS_MODE requires CHECKIN_BROKER_URL so check-in jobs are shared across workers")
+    print("🔐 Stateless mode: flow state is carried in signed tokens")
+
+def new_flow_controller(uid: str, language: str) -> FlowController:
+    return FlowController(uid, language, None, search_cache, airport_index, audit_log, config_store)
+
+def new_checkin_controller(uid: str, language: str) -> CheckinController:
+    return CheckinController(uid, language, None, checkin_jobs, audit_log, config_store)
+
+def restore_controller(flow: str, uid: str, language: str, state_token: Optional[str]):
+    """Rebuild a controller from a state token (stateless mode)"""
+    if not state_token:
+        raise HTTPException(status_code=400, detail="state_token is required in stateless mode")
+    controller = new_flow_controller(uid, language) if flow == "booking" else new_checkin_controller(uid, language)
+    try:
+        controller.restore_state(flow_state_codec.decode(state_token, flow, uid))
+    except InvalidStateToken as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    return controller
+
+def with_state_token(response: Dict[str, Any], flow: str, controller) -> Dict[str, Any]:
+    response["state_token"] = flow_state_codec.encode(flow, controller.uid, controller.export_state())
+    return response
+
+@app.on_event("startup")
+async def start_background_workers():
+    checkin_jobs.start()
+    slow_requests.start()
+    audit_log.start()
+    config_store.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await checkin_jobs.stop()
+    await audit_log.stop()
+    await config_store.stop()
+
 # Mount videos directory
 video_path = os.path.join(os.path.dirname(__file__), "..", "videos")
 if os.path.exists(video_path):
@@ -83,11 +175,14 @@ async def chat_endpoint(request: ChatRequest):
     try:
         uid = request.uid or str(uuid.uuid4())
 
+        if STATELESS_MODE:
+            return await stateless_chat(uid, request)
+
         if uid not in sessions:
             sessions[uid] = {
-                "flow_controller": FlowController(uid, request.language, avatar_engine),
-                "checkin_controller": CheckinController(uid, request.language, avatar_engine),
-                "chatbot": ChatbotIntegration(uid),
+                "flow_controller": new_flow_controller(uid, request.language),
+                "checkin_controller": new_checkin_controller(uid, request.language),
+                "chatbot": ChatbotIntegration(uid, config_store),
                 "current_step": None,
                 "language": request.language,
                 "booking_data": {},
@@ -126,10 +221,32 @@ async def chat_endpoint(request: ChatRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def stateless_chat(uid: str, request: ChatRequest) -> Dict[str, Any]:
+    """Chat without a server-side session; flows start with a fresh state token"""
+    chatbot_response = await ChatbotIntegration(uid, config_store).process_query(request.query, request.language)
+
+    if chatbot_response.get("trigger_avatar"):
+        controller = new_flow_controller(uid, request.language)
+        response = await controller.start_avatar_flow(request.query, request.language)
+        return with_state_token(response, "booking", controller)
+
+    if chatbot_response.get("trigger_checkin"):
+        controller = new_checkin_controller(uid, request.language)
+        response = await controller.start_checkin_flow(request.query, request.language)
+        return with_state_token(response, "checkin", controller)
+
+    chatbot_response["uid"] = uid
+    return chatbot_response
+
 @app.post("/avatar-step")
 async def process_avatar_step(request: StepRequest):
     """Process avatar booking step"""
     try:
+        if STATELESS_MODE:
+            controller = restore_controller("booking", request.uid, request.language, request.state_token)
+            response = await controller.process_step(request.step, request.user_input, request.language)
+            return with_state_token(response, "booking", controller)
+
         if request.uid not in sessions:
             raise HTTPException(status_code=404, detail="Session not found")
 
@@ -146,6 +263,8 @@ async def process_avatar_step(request: StepRequest):
         session["current_step"] = response.get("next_step")
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -153,6 +272,11 @@ async def process_avatar_step(request: StepRequest):
 async def process_checkin_step(request: StepRequest):
     """Process avatar check-in step"""
     try:
+        if STATELESS_MODE:
+            controller = restore_controller("checkin", request.uid, request.language, request.state_token)
+            response = await controller.process_step(request.step, request.user_input, request.language)
+            return with_state_token(response, "checkin", controller)
+
         if request.uid not in sessions:
             raise HTTPException(status_code=404, detail="Session not found")
 
@@ -169,14 +293,57 @@ async def process_checkin_step(request: StepRequest):
         session["current_step"] = response.get("next_step")
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/checkin-status/{uid}")
+async def get_checkin_status(
+    uid: str,
+    language: str = "en",
+    wait: float = 0,
+    state_token: Optional[str] = Header(None, alias="X-Flow-State")
+):
+    """
+    Poll (or long-poll with `wait` seconds) the check-in job for a session.
+    In stateless mode the state token comes in the X-Flow-State header, never the
+    query string, so it stays out of access logs.
+    """
+    wait = min(max(wait, 0), 25)
+    if STATELESS_MODE:
+        controller = restore_controller("checkin", uid, language, state_token)
+        response = await controller.get_checkin_status(language, wait)
+        return with_state_token(response, "checkin", controller)
+
+    if uid not in sessions:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    session = sessions[uid]
+    response = await session["checkin_controller"].get_checkin_status(language, wait)
+    session["current_step"] = response.get("step")
+    return response
+
+@app.get("/metrics/rate-limit")
+async def rate_limit_metrics():
+    """Requests rejected by each rate limit"""
+    return rate_limiter.rejected
+
+@app.get("/metrics/audit-log")
+async def audit_log_metrics():
+    """Audit events recorded, written and dropped"""
+    return audit_log.get_metrics()
+
+@app.get("/metrics/checkin-jobs")
+async def checkin_job_metrics():
+    """Check-in worker pool status"""
+    return checkin_jobs.get_metrics()
+
 @app.get("/avatar-video/{step}")
 async def get_avatar_video(step: str, language: str = "en"):
     """Get avatar video URL for a specific step"""
     try:
-        video_url = avatar_engine.get_video_url(step, language)
+        video_url = config_store.current.avatar_engine.get_video_url(step, language)
         return {
             "video_url": video_url,
             "step": step,
@@ -185,6 +352,21 @@ async def get_avatar_video(step: str, language: str = "en"):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/languages")
+async def list_languages():
+    """Languages available for the chatbot and avatar flows"""
+    languages = config_store.current.languages
+    return {"default": languages.default, "languages": languages.describe()}
+
+@app.get("/airports/autocomplete")
+async def autocomplete_airports(q: str, limit: int = 8, language: str = "en"):
+    """Autocomplete airports by IATA code or English/Hindi/transliterated city name"""
+    limit = max(1, min(limit, 20))
+    return {
+        "query": q,
+        "suggestions": airport_index.autocomplete(q, limit=limit, language=language)
+    }
+
 @app.get("/session/{uid}")
 async def get_session_info(uid: str):
     """Get current session information"""
@@ -205,9 +387,72 @@ async def clear_session(uid: str):
     """Clear session data"""
     if uid in sessions:
         del sessions[uid]
+        audit_log.record("session", "cleared", uid)
         return {"message": "Session cleared"}
     return {"message": "Session not found"}
 
+@app.get("/metrics/search-cache")
+async def search_cache_metrics():
+    """Flight search cache hit ratio and memory use"""
+    return search_cache.get_metrics()
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    """Admin endpoints need `Authorization: Bearer $ADMIN_TOKEN`; disabled when ADMIN_TOKEN is unset"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not authorization or not hmac.compare_digest(authorization, f"Bearer {admin_token}"):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@app.post("/search-cache/invalidate", dependencies=[Depends(require_admin)])
+async def invalidate_search_cache():
+    """Invalidate cached search results after the schedule dataset is reloaded"""
+    removed = search_cache.on_schedule_reload()
+    return {"message": "Search cache invalidated", "removed": removed}
+
+active_profiler = None
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin)])
+async def run_profiler(seconds: float = 10, interval_ms: float = 5):
+    """Sample all threads for `seconds` and return folded stacks (flamegraph.pl / speedscope)"""
+    global active_profiler
+    if active_profiler and active_profiler.running:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    active_profiler = SamplingProfiler(interval=max(interval_ms, 1) / 1000)
+    active_profiler.start()
+    try:
+        await asyncio.sleep(min(max(seconds, 0.1), 60))
+    finally:
+        samples = await asyncio.to_thread(active_profiler.stop)
+    return PlainTextResponse(to_folded(samples))
+
+@app.get("/admin/slow-requests", dependencies=[Depends(require_admin)])
+async def list_slow_requests():
+    """Recent requests over SLOW_REQUEST_THRESHOLD_MS (newest first)"""
+    return {"threshold_ms": slow_requests.threshold * 1000, "requests": slow_requests.list_traces()}
+
+@app.get("/admin/slow-requests/{trace_id}", dependencies=[Depends(require_admin)])
+async def get_slow_request(trace_id: str):
+    """Folded stack samples captured while a slow request was running"""
+    trace = slow_requests.get_trace(trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return PlainTextResponse(to_folded(trace["samples"]))
+
+@app.post("/admin/reload", dependencies=[Depends(require_admin)])
+async def reload_config():
+    """Rebuild flows, message catalogs and video mappings, then swap them in atomically"""
+    result = await config_store.reload()
+    if not result["success"]:
+        raise HTTPException(status_code=422, detail=result)
+    return result
+
+@app.get("/admin/config", dependencies=[Depends(require_admin)])
+async def config_status():
+    """Live config version, reload counters and validation warnings"""
+    return config_store.get_metrics()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -216,7 +461,7 @@ async def health_check():
 @app.post("/test-avatar")
 async def test_avatar_trigger(request: ChatRequest):
     """Test endpoint to verify avatar trigger logic"""
-    chatbot = ChatbotIntegration("test_uid")
+    chatbot = ChatbotIntegration("test_uid", config_store)
     result = await chatbot.process_query(request.query, request.language)
     return {
         "query": request.query,
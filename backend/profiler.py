@@ -0,0 +1,218 @@
+import os
+import sys
+import time
+import uuid
+import asyncio
+import threading
+from collections import Counter, deque
+from typing import Dict, Any, List, Optional
+
+MAX_STACK_DEPTH = 64
+
+
+def _frame_stack(frame) -> str:
+    """Collapse a frame into a root-first, semicolon-separated stack"""
+    parts = []
+    while frame is not None and len(parts) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def _task_stack(task) -> str:
+    """Root-first chain of the coroutines a suspended task is awaiting through"""
+    parts = []
+    coro = task.get_coro()
+    while coro is not None and len(parts) < MAX_STACK_DEPTH:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            parts.append(f"<{type(coro).__name__}>")
+            break
+        parts.append(f"{frame.f_code.co_name} ({os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno})")
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return ";".join(parts)
+
+
+def to_folded(samples: Counter) -> str:
+    """Render stack counts in the folded format read by flamegraph.pl and speedscope"""
+    return "\n".join(f"{stack} {count}" for stack, count in samples.most_common())
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for every Python thread.
+    A background thread snapshots `sys._current_frames()` every `interval` seconds,
+    so profiled code runs unmodified and overhead stays proportional to the sample rate.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                if ident not in names:
+                    names[ident] = next((t.name for t in threading.enumerate() if t.ident == ident), str(ident))
+                self.samples[f"{names[ident]};{_frame_stack(frame)}"] += 1
+            self.sample_count += 1
+
+
+class SlowRequestCapture:
+    """
+    Captures stack samples for requests that exceed a latency threshold.
+    - A watchdog thread samples the serving thread of any in-flight request
+      once it is older than the threshold
+    - Completed slow requests go into a bounded ring buffer
+    - While a request's task is suspended (awaiting I/O), its sample is the thread
+      stack followed by the task's await chain; while it runs, the thread stack
+      already contains its frames
+    """
+
+    def __init__(self, threshold_ms: float = 1000, max_traces: int = 50, interval: float = 0.005):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval
+        self.traces: deque = deque(maxlen=max_traces)
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, name="slow-request-watchdog", daemon=True)
+        self._thread.start()
+
+    def begin(self, method: str, path: str) -> str:
+        """Register an in-flight request; returns its token for `end`"""
+        token = uuid.uuid4().hex
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        with self._lock:
+            self._in_flight[token] = {
+                "method": method,
+                "path": path,
+                "thread": threading.get_ident(),
+                "task": task,
+                "started": time.perf_counter(),
+                "started_at": time.time(),
+                "samples": Counter()
+            }
+        self._wake.set()
+        return token
+
+    def end(self, token: str, status: Optional[int] = None) -> None:
+        with self._lock:
+            record = self._in_flight.pop(token, None)
+        if not record:
+            return
+        duration = time.perf_counter() - record["started"]
+        if duration >= self.threshold:
+            self.traces.append({
+                "id": token,
+                "method": record["method"],
+                "path": record["path"],
+                "status": status,
+                "started_at": record["started_at"],
+                "duration_ms": round(duration * 1000, 1),
+                "samples": record["samples"]
+            })
+
+    def list_traces(self) -> List[Dict[str, Any]]:
+        summaries = []
+        for trace in reversed(self.traces):
+            summary = {key: value for key, value in trace.items() if key != "samples"}
+            summary["sample_count"] = sum(trace["samples"].values())
+            summaries.append(summary)
+        return summaries
+
+    def get_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        return next((trace for trace in self.traces if trace["id"] == trace_id), None)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._in_flight:
+                    self._wake.clear()
+                    continue
+                oldest = min(record["started"] for record in self._in_flight.values())
+
+            # Sleep until the oldest request turns slow, then sample at `interval`
+            time.sleep(max(self.interval, oldest + self.threshold - time.perf_counter()))
+            now = time.perf_counter()
+            with self._lock:
+                slow = [(token, record["thread"], record["task"]) for token, record in self._in_flight.items()
+                        if now - record["started"] >= self.threshold]
+            frames = sys._current_frames()
+            stacks = {}
+            for token, thread, task in slow:
+                if thread not in frames:
+                    continue
+                stack = _frame_stack(frames[thread])
+                coro = task.get_coro() if task is not None and not task.done() else None
+                if coro is not None and not getattr(coro, "cr_running", False):
+                    stack = f"{stack};<awaiting>;{_task_stack(task)}"
+                stacks[token] = stack
+
+            # Count under the lock and only while the request is in flight: once `end`
+            # pops a record its Counter belongs to `traces` and must not change
+            with self._lock:
+                for token, stack in stacks.items():
+                    record = self._in_flight.get(token)
+                    if record:
+                        record["samples"][stack] += 1
+
+
+class SlowRequestMiddleware:
+    """ASGI middleware that times requests on `paths` through SlowRequestCapture"""
+
+    def __init__(self, app, capture: SlowRequestCapture, paths=("/chat", "/avatar-step", "/checkin-step")):
+        self.app = app
+        self.capture = capture
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        token = self.capture.begin(scope["method"], scope["path"])
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.capture.end(token, status)
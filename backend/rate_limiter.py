@@ -0,0 +1,275 @@
+import os
+import json
+import time
+from typing import Dict, Any, Optional, Tuple, Callable
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+def parse_rate(spec: str) -> Tuple[float, float]:
+    """
+    Parse a limit like "60/minute" into (tokens per second, burst).
+
+    The burst equals the count, so a full bucket allows that many back-to-back requests.
+    """
+    count, period = spec.strip().split("/")
+    count = float(count)
+    return count / PERIODS[period.strip().rstrip("s")], count
+
+
+class InMemoryRateLimitBackend:
+    """Token buckets in a dict; fine for a single worker process"""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self.buckets: Dict[str, list] = {}
+
+    async def consume(self, key: str, rate: float, burst: float, cost: float = 1) -> Tuple[bool, float]:
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self._prune(now)
+            bucket = self.buckets[key] = [burst, now, rate, burst]
+
+        tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= cost:
+            bucket[0] = tokens - cost
+            return True, 0.0
+        bucket[0] = tokens
+        return False, (cost - tokens) / rate
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled completely (idle clients)"""
+        full = [key for key, (tokens, ts, rate, burst) in self.buckets.items()
+                if tokens + (now - ts) * rate >= burst]
+        for key in full:
+            del self.buckets[key]
+        # Still full of active clients: drop the oldest half
+        if len(self.buckets) >= self.max_keys:
+            oldest = sorted(self.buckets, key=lambda k: self.buckets[k][1])
+            for key in oldest[:len(oldest) // 2]:
+                del self.buckets[key]
+
+
+class RedisRateLimitBackend:
+    """
+    Token buckets in Redis, shared by every worker.
+    Requires the optional `redis` package.
+    """
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or burst
+    local ts = tonumber(data[2]) or now
+    tokens = math.min(burst, tokens + (now - ts) * rate)
+    local allowed = 0
+    local retry = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+    return {allowed, tostring(retry)}
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ImportError("RedisRateLimitBackend requires the 'redis' package: pip install redis")
+        self.redis = redis.from_url(url)
+        self.prefix = prefix
+        self.script = self.redis.register_script(self.SCRIPT)
+
+    async def consume(self, key: str, rate: float, burst: float, cost: float = 1) -> Tuple[bool, float]:
+        allowed, retry = await self.script(keys=[self.prefix + key], args=[rate, burst, cost])
+        return bool(allowed), float(retry)
+
+
+class RateLimiter:
+    """
+    Token bucket limits per client IP, per session uid, and a global cap on new sessions.
+    Each limit is a (tokens per second, burst) pair; None disables it.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        per_ip: Optional[Tuple[float, float]] = None,
+        per_uid: Optional[Tuple[float, float]] = None,
+        new_sessions: Optional[Tuple[float, float]] = None
+    ):
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.per_ip = per_ip
+        self.per_uid = per_uid
+        self.new_sessions = new_sessions
+        self.rejected = {"ip": 0, "uid": 0, "new_session": 0}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Build the limiter from RATE_LIMIT_* environment variables"""
+        redis_url = os.getenv("RATE_LIMIT_REDIS_URL")
+        backend = RedisRateLimitBackend(redis_url) if redis_url else InMemoryRateLimitBackend()
+        return cls(
+            backend,
+            per_ip=parse_rate(os.getenv("RATE_LIMIT_PER_IP", "60/minute")),
+            per_uid=parse_rate(os.getenv("RATE_LIMIT_PER_UID", "30/minute")),
+            new_sessions=parse_rate(os.getenv("RATE_LIMIT_NEW_SESSIONS", "600/minute"))
+        )
+
+    async def check(self, ip: str, uid: Optional[str], is_new_session: bool) -> Tuple[bool, float, Optional[str]]:
+        """
+        Consume one token from each applicable bucket.
+
+        Returns:
+            (allowed, retry_after_seconds, name of the limit that rejected)
+        """
+        result = await self.check_ip(ip)
+        if not result[0]:
+            return result
+        return await self.check_session(uid, is_new_session)
+
+    async def check_ip(self, ip: str) -> Tuple[bool, float, Optional[str]]:
+        """Per-IP bucket only; needs nothing from the request body"""
+        checks = [("ip", f"ip:{ip}", self.per_ip)] if self.per_ip else []
+        return await self._consume(checks)
+
+    async def check_session(self, uid: Optional[str], is_new_session: bool) -> Tuple[bool, float, Optional[str]]:
+        """Per-uid and new-session buckets"""
+        checks = []
+        if uid and self.per_uid:
+            checks.append(("uid", f"uid:{uid}", self.per_uid))
+        if is_new_session and self.new_sessions:
+            checks.append(("new_session", "global:new_session", self.new_sessions))
+        return await self._consume(checks)
+
+    async def _consume(self, checks) -> Tuple[bool, float, Optional[str]]:
+        for name, key, (rate, burst) in checks:
+            allowed, retry_after = await self.backend.consume(key, rate, burst)
+            if not allowed:
+                self.rejected[name] += 1
+                return False, retry_after, name
+        return True, 0.0, None
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware that rate-limits POSTs to the given paths before routing.
+    - Checks the per-IP bucket before reading the body
+    - Reads `uid` from the JSON body (413 above `max_body_bytes`) and replays it to the app
+    - Answers 429 with Retry-After without touching controllers or Sarvam
+    """
+
+    def __init__(
+        self,
+        app,
+        limiter: RateLimiter,
+        paths=("/chat",),
+        session_exists: Optional[Callable[[str], bool]] = None,
+        trusted_proxies: int = 0,
+        max_body_bytes: int = 64 * 1024
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.paths = frozenset(paths)
+        self.session_exists = session_exists or (lambda uid: False)
+        self.trusted_proxies = trusted_proxies
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after, limit = await self.limiter.check_ip(self._client_ip(scope))
+        if not allowed:
+            await self._reject(send, retry_after, limit)
+            return
+
+        content_length = dict(scope.get("headers", [])).get(b"content-length", b"0")
+        if content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            await self._too_large(send)
+            return
+
+        body, more_body = b"", True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if len(body) > self.max_body_bytes:
+                await self._too_large(send)
+                return
+            more_body = message.get("more_body", False)
+
+        uid = self._read_uid(body)
+        allowed, retry_after, limit = await self.limiter.check_session(uid, not uid or not self.session_exists(uid))
+        if not allowed:
+            await self._reject(send, retry_after, limit)
+            return
+
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay, send)
+
+    def _client_ip(self, scope) -> str:
+        """
+        Client address as seen by the outermost of `trusted_proxies` proxies.
+        Each proxy appends the address it received from, so only entries counted
+        from the right are trustworthy; anything further left is client-supplied.
+        """
+        if self.trusted_proxies:
+            forwarded = []
+            for name, value in scope.get("headers", []):
+                if name == b"x-forwarded-for":
+                    forwarded += [entry.strip() for entry in value.decode("latin-1").split(",") if entry.strip()]
+            if len(forwarded) >= self.trusted_proxies:
+                return forwarded[-self.trusted_proxies]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def _read_uid(body: bytes) -> Optional[str]:
+        try:
+            uid = json.loads(body).get("uid")
+        except (ValueError, AttributeError, RecursionError):
+            return None
+        return uid if isinstance(uid, str) else None
+
+    @staticmethod
+    async def _respond(send, status: int, detail: Dict[str, Any], headers=()) -> None:
+        body = json.dumps(detail).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _reject(self, send, retry_after: float, limit: str) -> None:
+        retry = str(max(1, int(retry_after + 0.999))).encode()
+        await self._respond(send, 429, {"detail": "Too many requests", "limit": limit}, [(b"retry-after", retry)])
+
+    async def _too_large(self, send) -> None:
+        await self._respond(send, 413, {"detail": f"Request body exceeds {self.max_body_bytes} bytes"})
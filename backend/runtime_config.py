@@ -0,0 +1,274 @@
+import os
+import glob
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from avatar_engine import AvatarEngine, BUNDLE_MANIFEST, DEFAULT_VIDEO_ROOT, FLOW_CONFIG_PATH, load_video_files
+from language_registry import LanguageRegistry, DEFAULT_LANGUAGES_PATH
+from language_catalog import LanguageCatalogs, CATALOG_DIR
+
+logger = logging.getLogger(__name__)
+
+FLOWS = ("booking", "checkin")
+
+
+def load_flow_tables(path: str = FLOW_CONFIG_PATH) -> Dict[str, Dict[str, str]]:
+    """Step tables per flow: step -> next step ("complete" ends the flow)"""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    return {flow: dict(config[flow]["step_flow"]) for flow in FLOWS}
+
+
+def watched_files(video_root: str = DEFAULT_VIDEO_ROOT) -> List[str]:
+    """Source files a snapshot is built from"""
+    files = [FLOW_CONFIG_PATH, DEFAULT_LANGUAGES_PATH, os.path.join(video_root, BUNDLE_MANIFEST)]
+    return files + sorted(glob.glob(os.path.join(CATALOG_DIR, "*.json")))
+
+
+def sources_signature(video_root: str = DEFAULT_VIDEO_ROOT) -> Tuple:
+    """(path, mtime, size) of every watched file; missing files count as (path, None, None)"""
+    signature = []
+    for path in watched_files(video_root):
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class RuntimeConfig:
+    """
+    Immutable snapshot of everything that can be reloaded without a restart.
+    - Booking and check-in step tables
+    - Language registry and compiled message catalogs
+    - AvatarEngine (step -> clip mapping, video folders and bundle offsets)
+    A snapshot is never modified after it is built; reloading builds a new one.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        flows: Dict[str, Dict[str, str]],
+        languages: LanguageRegistry,
+        catalogs: LanguageCatalogs,
+        avatar_engine: AvatarEngine,
+        signature: Tuple = ()
+    ):
+        self.version = version
+        self.flows = flows
+        self.languages = languages
+        self.catalogs = catalogs
+        self.avatar_engine = avatar_engine
+        self.signature = signature
+        self.loaded_at = time.time()
+        self.warnings: List[str] = []
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "flows": {flow: len(steps) for flow, steps in self.flows.items()},
+            "languages": self.languages.codes(),
+            "catalog_set": os.path.basename(self.catalogs.version_dir or ""),
+            "bundles": {flow: sorted(folders) for flow, folders in self.avatar_engine.bundles.items()},
+            "warnings": self.warnings
+        }
+
+
+def build_runtime_config(version: int, avatar_base: Optional[str] = None,
+                         video_root: str = DEFAULT_VIDEO_ROOT) -> RuntimeConfig:
+    """Load every source and compile the catalogs; blocking, so run it off the event loop"""
+    signature = sources_signature(video_root)
+    languages = LanguageRegistry.from_file()
+    catalogs = LanguageCatalogs(default_language=languages.default)
+    catalogs.load()
+    return RuntimeConfig(
+        version,
+        load_flow_tables(),
+        languages,
+        catalogs,
+        AvatarEngine(base_ip=avatar_base, languages=languages, video_root=video_root,
+                     video_files=load_video_files()),
+        signature
+    )
+
+
+def validate_runtime_config(config: RuntimeConfig, video_root: str = DEFAULT_VIDEO_ROOT) -> Tuple[List[str], List[str]]:
+    """
+    Check a snapshot before it goes live.
+
+    Returns:
+        (errors, warnings) - any error rejects the snapshot
+    """
+    errors, warnings = [], []
+    default = config.languages.default
+
+    for flow, steps in config.flows.items():
+        if not steps:
+            errors.append(f"{flow}: step table is empty")
+        for step, next_step in steps.items():
+            if next_step != "complete" and next_step not in steps:
+                errors.append(f"{flow}: '{step}' points to unknown step '{next_step}'")
+            if config.catalogs.get(default, f"{flow}.{step}") is None:
+                errors.append(f"{flow}: no '{default}' message for step '{step}'")
+
+    for code in config.languages.codes():
+        video_config = config.languages.video_config(code)
+        # get_video_url formats clip names with these keys
+        for key in ("video_folder", "video_suffix", "checkin_video_suffix"):
+            if not video_config.get(key):
+                errors.append(f"language '{code}' has no {key}")
+        if code not in config.catalogs.languages:
+            warnings.append(f"language '{code}' has no catalog - messages fall back to '{default}'")
+
+    for flow, folders in config.avatar_engine.bundles.items():
+        for folder, bundle in folders.items():
+            unknown = set(bundle.get("steps", {})) - set(config.flows.get(flow, {}))
+            if unknown:
+                warnings.append(f"{flow}/{folder} bundle has steps not in the flow: {', '.join(sorted(unknown))}")
+            if not os.path.exists(os.path.join(video_root, bundle.get("file", ""))):
+                errors.append(f"{flow}/{folder} bundle file is missing: {bundle.get('file')}")
+
+    for step in config.flows.get("booking", {}):
+        url = config.avatar_engine.get_video_url(step, default)
+        if not url:
+            warnings.append(f"booking: no video mapped for '{step}'")
+        elif not os.path.exists(os.path.join(video_root, url[len(config.avatar_engine.base_url) + 1:])):
+            warnings.append(f"booking: video file missing for '{step}'")
+
+    return errors, warnings
+
+
+class ConfigStore:
+    """
+    Holds the live RuntimeConfig and swaps in new ones without downtime.
+    - Readers take `store.current` once per step: a single attribute read, no lock
+    - `reload` builds and validates a new snapshot in a worker thread, then
+      publishes it with one reference assignment
+    - A failed build or validation leaves the live snapshot untouched
+    - Sessions holding the old snapshot keep using it until their next step
+    - An optional polling watcher reloads when any watched file changes
+    - Replaced snapshots older than the previous one have their catalog mmaps
+      closed `retire_grace` seconds after they stopped being current. Compiled
+      catalog directories are shared by every worker on the host, so they are
+      only pruned offline (python language_catalog.py)
+    """
+
+    def __init__(self, builder: Callable[[int], RuntimeConfig], watch_interval: float = 0,
+                 video_root: str = DEFAULT_VIDEO_ROOT, retire_grace: float = 300):
+        self.builder = builder
+        self.watch_interval = watch_interval
+        self.video_root = video_root
+        self.retire_grace = retire_grace
+        # (replaced_at, snapshot) oldest first; the last one is the previous snapshot
+        self._replaced: deque = deque()
+        self.reloads = 0
+        self.failed_reloads = 0
+        self.last_error: Optional[str] = None
+
+        config = builder(1)
+        errors, config.warnings = validate_runtime_config(config, video_root)
+        if errors:
+            raise ValueError(f"Invalid runtime config: {'; '.join(errors)}")
+        self.current = config
+
+        self._reload_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, avatar_base: Optional[str] = None) -> "ConfigStore":
+        """Build the store; CONFIG_WATCH_INTERVAL (seconds) enables the file watcher"""
+        return cls(
+            lambda version: build_runtime_config(version, avatar_base),
+            watch_interval=float(os.getenv("CONFIG_WATCH_INTERVAL", "0")),
+            retire_grace=float(os.getenv("CONFIG_RETIRE_GRACE", "300"))
+        )
+
+    async def reload(self) -> Dict[str, Any]:
+        """
+        Build, validate and publish a new snapshot.
+
+        Returns:
+            Dict with 'success', the live 'version' and any 'errors'/'warnings'
+        """
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+
+        # Only reloads are serialized; request handlers never touch this lock
+        async with self._reload_lock:
+            version = self.current.version + 1
+            try:
+                config = await asyncio.to_thread(self.builder, version)
+                errors, config.warnings = await asyncio.to_thread(validate_runtime_config, config, self.video_root)
+            except Exception as e:
+                errors = [f"build failed: {str(e)}"]
+                config = None
+
+            if errors:
+                if config is not None:
+                    self._release(config)
+                self.failed_reloads += 1
+                self.last_error = "; ".join(errors)
+                logger.error(f"Config reload rejected, keeping version {self.current.version}: {self.last_error}")
+                return {"success": False, "version": self.current.version, "errors": errors}
+
+            self._replaced.append((time.time(), self.current))
+            self.current = config
+            self.reloads += 1
+            self.last_error = None
+            logger.info(f"Config version {version} is live")
+            self._release_retired()
+            return {"success": True, "version": version, "errors": [], "warnings": config.warnings}
+
+    def start(self) -> None:
+        """Start the file watcher on the running event loop (no-op unless enabled)"""
+        if self.watch_interval > 0 and not self._task:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.current.describe(),
+            "reloads": self.reloads,
+            "failed_reloads": self.failed_reloads,
+            "last_error": self.last_error,
+            "retained_snapshots": len(self._replaced),
+            "watching": self._task is not None
+        }
+
+    def _release_retired(self) -> None:
+        """Release snapshots older than the previous one once their grace period has passed"""
+        cutoff = time.time() - self.retire_grace
+        while len(self._replaced) > 1 and self._replaced[0][0] < cutoff:
+            _, config = self._replaced.popleft()
+            self._release(config)
+
+    @staticmethod
+    def _release(config: RuntimeConfig) -> None:
+        """Unmap a snapshot's catalogs; its compiled set stays for workers that have not reloaded"""
+        config.catalogs.close()
+
+    async def _watch(self) -> None:
+        rejected = None
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            self._release_retired()
+            signature = await asyncio.to_thread(sources_signature, self.video_root)
+            # Don't retry a rejected change until the files change again
+            if signature == self.current.signature or signature == rejected:
+                continue
+            result = await self.reload()
+            rejected = None if result["success"] else signature
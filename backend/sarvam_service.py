@@ -2,6 +2,7 @@ import os
 import requests
 from typing import Dict, Any, Optional
 import logging
+from language_registry import registry
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +21,8 @@ class SarvamService:
             "Content-Type": "application/json"
         }
         
-        # Language mapping
-        self.lang_codes = {
-            "en": "en-IN",
-            "hi": "hi-IN"
-        }
+        # Sarvam language codes come from the language registry
+        self.languages = registry
     
     async def translate_text(self, text: str, target_language: str, source_language: str = "en") -> str:
         """
@@ -44,8 +42,8 @@ class SarvamService:
                 return text
             
             # Get Sarvam language codes
-            source_lang = self.lang_codes.get(source_language, "en-IN")
-            target_lang = self.lang_codes.get(target_language, "hi-IN")
+            source_lang = self.languages.sarvam_code(source_language, "en-IN")
+            target_lang = self.languages.sarvam_code(target_language, "hi-IN")
             
             payload = {
                 "input": text,
@@ -87,7 +85,7 @@ class SarvamService:
             Audio URL or None if failed
         """
         try:
-            lang_code = self.lang_codes.get(language, "hi-IN")
+            lang_code = self.languages.sarvam_code(language, "hi-IN")
             
             payload = {
                 "inputs": [text],
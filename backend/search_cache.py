@@ -0,0 +1,156 @@
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable, List
+
+
+class SearchCache:
+    """
+    TTL + LRU cache for flight search results.
+    - Keyed on the normalized (origin, destination, date, pax) tuple
+    - Entries expire after `ttl_seconds`
+    - Least recently used entries are evicted past `max_entries`
+    - Tracks hits/misses and approximate memory use for metrics
+    - Results are stored as a tuple and handed out as fresh lists of copied
+      flights, so callers can't alter what other sessions get
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, tuple]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reload_hooks: List[Callable[[], None]] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(origin: Any, destination: Any, date: Any, pax: Any) -> Tuple:
+        """Normalize search parameters into a hashable cache key"""
+        def norm(value: Any) -> str:
+            return str(value or "").strip().casefold()
+
+        if isinstance(pax, dict):
+            pax_key = (
+                int(pax.get("adults", 1) or 0),
+                int(pax.get("children", 0) or 0),
+                int(pax.get("infants", 0) or 0),
+            )
+        else:
+            pax_key = (int(pax or 1), 0, 0)
+
+        return (norm(origin), norm(destination), norm(date), pax_key)
+
+    def get(self, key: Tuple) -> Optional[list]:
+        """Return cached results for `key`, or None on a miss/expired entry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, results = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._copy(results)
+
+    def put(self, key: Tuple, results: list) -> None:
+        """Store results for `key`, evicting the oldest entries if full"""
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, tuple(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], list]) -> list:
+        """Return cached results or compute, store and return them"""
+        results = self.get(key)
+        if results is None:
+            results = compute()
+            self.put(key, results)
+            results = self._copy(results)
+        return results
+
+    @staticmethod
+    def _copy(results) -> list:
+        return [dict(flight) if isinstance(flight, dict) else flight for flight in results]
+
+    def invalidate(self, predicate: Optional[Callable[[Tuple], bool]] = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            predicate: Optional filter on the key; drops everything when omitted
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if predicate is None:
+                removed = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [key for key in self._entries if predicate(key)]
+                for key in stale:
+                    del self._entries[key]
+                removed = len(stale)
+            self.invalidations += removed
+        return removed
+
+    def invalidate_route(self, origin: str, destination: str) -> int:
+        """Drop every cached date/pax combination for one route"""
+        origin = str(origin or "").strip().casefold()
+        destination = str(destination or "").strip().casefold()
+        return self.invalidate(lambda key: key[0] == origin and key[1] == destination)
+
+    def register_reload_hook(self, hook: Callable[[], None]) -> None:
+        """Register a callback to run after the schedule dataset is reloaded"""
+        self._reload_hooks.append(hook)
+
+    def on_schedule_reload(self) -> int:
+        """Invalidate everything and notify hooks; call when schedules change"""
+        removed = self.invalidate()
+        for hook in list(self._reload_hooks):
+            hook()
+        return removed
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by cached keys and results"""
+        with self._lock:
+            items = list(self._entries.items())
+        total = sys.getsizeof(self._entries)
+        for key, (_, results) in items:
+            total += sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+            total += sys.getsizeof(results)
+            for flight in results:
+                total += sys.getsizeof(flight)
+                if isinstance(flight, dict):
+                    total += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in flight.items())
+        return total
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit ratio, size and memory metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "memory_bytes": self.memory_bytes()
+        }
@@ -0,0 +1,183 @@
+import re
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, Tuple, Callable
+
+# A field validator returns (normalized_value, None) or (None, error_code).
+# Error codes are keys into the controllers' message tables.
+FieldResult = Tuple[Any, Optional[str]]
+
+PNR_RE = re.compile(r"[A-Z0-9]{6}")
+NAME_RE = re.compile(r"[A-Za-z]+(?:[ '.\-]+[A-Za-z]+)*\.?")
+MOBILE_STRIP_RE = re.compile(r"[\s\-().]")
+E164_RE = re.compile(r"\+[1-9]\d{7,14}")
+INDIAN_MOBILE_RE = re.compile(r"(?:\+?91|0)?([6-9]\d{9})")
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)*\.[A-Za-z]{2,}")
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+MAX_BOOKING_DAYS = 365
+MAX_SEATED_PASSENGERS = 9
+
+
+def validate_pnr(value: Any) -> FieldResult:
+    pnr = str(value or "").strip().upper()
+    if PNR_RE.fullmatch(pnr):
+        return pnr, None
+    return None, "invalid_pnr"
+
+
+def validate_name(value: Any) -> FieldResult:
+    name = " ".join(str(value or "").split())
+    if 0 < len(name) <= 50 and NAME_RE.fullmatch(name):
+        return name, None
+    return None, "invalid_last_name"
+
+
+def validate_mobile(value: Any) -> FieldResult:
+    """Normalize to E.164; bare 10-digit Indian numbers get +91, other +91 numbers are rejected"""
+    mobile = MOBILE_STRIP_RE.sub("", str(value or ""))
+    indian = INDIAN_MOBILE_RE.fullmatch(mobile)
+    if indian:
+        return f"+91{indian.group(1)}", None
+    if mobile.startswith("00"):
+        mobile = "+" + mobile[2:]
+    # +91 numbers must be valid Indian mobiles, not just valid E.164
+    if mobile.startswith("+91"):
+        return None, "invalid_mobile"
+    if E164_RE.fullmatch(mobile):
+        return mobile, None
+    return None, "invalid_mobile"
+
+
+def validate_email(value: Any) -> FieldResult:
+    email = str(value or "").strip()
+    if len(email) <= 254 and EMAIL_RE.fullmatch(email):
+        local, domain = email.rsplit("@", 1)
+        return f"{local}@{domain.lower()}", None
+    return None, "invalid_email"
+
+
+def validate_travel_date(value: Any) -> FieldResult:
+    text = str(value or "").strip()
+    if not DATE_RE.fullmatch(text):
+        return None, "invalid_date"
+    try:
+        travel_date = date.fromisoformat(text)
+    except ValueError:
+        return None, "invalid_date"
+
+    today = date.today()
+    if travel_date < today:
+        return None, "date_in_past"
+    if travel_date > today + timedelta(days=MAX_BOOKING_DAYS):
+        return None, "date_too_far"
+    return text, None
+
+
+def validate_passengers(value: Any) -> FieldResult:
+    if not isinstance(value, dict):
+        value = {"adults": value}
+    try:
+        pax = {
+            "adults": int(value.get("adults", 1)),
+            "children": int(value.get("children", 0) or 0),
+            "infants": int(value.get("infants", 0) or 0)
+        }
+    except (TypeError, ValueError):
+        return None, "invalid_passengers"
+
+    if pax["adults"] < 1 or pax["children"] < 0 or pax["infants"] < 0:
+        return None, "invalid_passengers"
+    if pax["adults"] + pax["children"] > MAX_SEATED_PASSENGERS:
+        return None, "too_many_passengers"
+    if pax["infants"] > pax["adults"]:
+        return None, "infants_exceed_adults"
+    return pax, None
+
+
+def validate_consent(value: Any) -> FieldResult:
+    if isinstance(value, bool):
+        return value, None
+    text = str(value).strip().lower()
+    if text in ("true", "yes", "1", "हाँ", "हां"):
+        return True, None
+    if text in ("false", "no", "0", "नहीं"):
+        return False, None
+    return None, "invalid_consent"
+
+
+FIELD_VALIDATORS: Dict[str, Callable[[Any], FieldResult]] = {
+    "pnr": validate_pnr,
+    "name": validate_name,
+    "mobile": validate_mobile,
+    "email": validate_email,
+    "date": validate_travel_date,
+    "passengers": validate_passengers,
+    "consent": validate_consent
+}
+
+# Declarative per-step schemas: step -> {input field: field type}
+CHECKIN_SCHEMA = {
+    "pnr_collection": {"pnr": "pnr"},
+    "lastname_collection": {"last_name": "name"},
+    "mobile_collection": {"mobile": "mobile"},
+    "email_collection": {"email": "email"},
+    "seat_consent": {"consent": "consent"}
+}
+
+BOOKING_SCHEMA = {
+    "date_selection": {"date": "date"},
+    "passenger_selection": {"passengers": "passengers"},
+    "contact_details": {"mobile": "mobile", "email": "email"}
+}
+
+
+class StepValidator:
+    """
+    Validates and normalizes step input against a declarative schema.
+    - The schema is compiled once into a field -> validator table
+    - Fields declared by the step are required (when `require_step_fields` is set)
+    - Known fields sent under another step are still validated when present
+    """
+
+    def __init__(self, schema: Dict[str, Dict[str, str]], require_step_fields: bool = True):
+        self.required: Dict[str, Tuple[str, ...]] = {}
+        self.validators: Dict[str, Callable[[Any], FieldResult]] = {}
+
+        for step, fields in schema.items():
+            if require_step_fields:
+                self.required[step] = tuple(fields)
+            for field, kind in fields.items():
+                self.validators[field] = FIELD_VALIDATORS[kind]
+
+    def validate(self, step: str, user_input: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """
+        Validate `user_input` for `step`, normalizing values in place.
+
+        Returns:
+            None if valid, else (field, error_code); input that is not an object
+            is reported as ("user_input", "missing_field")
+        """
+        if user_input is None:
+            user_input = {}
+        if not isinstance(user_input, dict):
+            return "user_input", "missing_field"
+
+        for field in self.required.get(step, ()):
+            if field not in user_input:
+                return field, "missing_field"
+
+        for field, value in user_input.items():
+            validator = self.validators.get(field)
+            if validator is None:
+                continue
+            normalized, error = validator(value)
+            if error:
+                return field, error
+            user_input[field] = normalized
+        return None
+
+
+checkin_validator = StepValidator(CHECKIN_SCHEMA)
+# The web client posts booking fields under the name of the step it moves to,
+# so booking fields are validated wherever they appear rather than required per step
+booking_validator = StepValidator(BOOKING_SCHEMA, require_step_fields=False)
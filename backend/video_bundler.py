@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Offline bundler: joins each (flow, language) clip set into one faststart MP4
+with a chapter per step, and writes videos/bundles/manifest.json with the
+start/end offset of every step inside its bundle.
+
+Requires ffmpeg and ffprobe on PATH. Run after adding or changing videos:
+
+    python video_bundler.py            # stream copy (clips share codecs)
+    python video_bundler.py --reencode # normalize mismatched clips
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, Any, List, Optional, Tuple
+
+from avatar_engine import AvatarEngine, BUNDLE_DIR, BUNDLE_MANIFEST
+from language_registry import registry
+from runtime_config import load_flow_tables
+
+VIDEO_ROOT = os.path.join(os.path.dirname(__file__), "..", "videos")
+
+
+def flow_steps() -> Dict[str, List[str]]:
+    """Step order per flow, taken from configs/flow_config.json"""
+    return {flow: list(steps) for flow, steps in load_flow_tables().items()}
+
+
+def clip_path(engine: AvatarEngine, flow: str, step: str, language: str) -> Optional[str]:
+    """Local file for a step's clip, derived from the same URL mapping the API serves"""
+    folder = "avatar_checkin" if flow == "checkin" else None
+    url = engine.get_video_url(step, language, folder=folder)
+    if not url:
+        return None
+    path = os.path.join(VIDEO_ROOT, url[len(engine.base_url) + 1:])
+    return path if os.path.exists(path) else None
+
+
+def probe_duration(path: str) -> float:
+    output = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip())
+
+
+def write_chapters(path: str, chapters: List[Tuple[str, float, float]]) -> None:
+    """FFMETADATA chapters so players can also show per-step markers"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(";FFMETADATA1\n")
+        for step, start, end in chapters:
+            f.write(f"[CHAPTER]\nTIMEBASE=1/1000\nSTART={int(start * 1000)}\nEND={int(end * 1000)}\ntitle={step}\n")
+
+
+def build_bundle(clips: List[Tuple[str, str]], output: str, reencode: bool) -> Dict[str, List[float]]:
+    """
+    Concatenate (step, clip path) pairs into `output`.
+
+    Returns:
+        step -> [start_seconds, end_seconds]
+    """
+    offsets, chapters, position = {}, [], 0.0
+    for step, path in clips:
+        duration = probe_duration(path)
+        offsets[step] = [round(position, 3), round(position + duration, 3)]
+        chapters.append((step, position, position + duration))
+        position += duration
+
+    with tempfile.TemporaryDirectory() as tmp:
+        concat_list = os.path.join(tmp, "clips.txt")
+        with open(concat_list, "w", encoding="utf-8") as f:
+            for _, path in clips:
+                f.write(f"file '{os.path.abspath(path)}'\n")
+        metadata = os.path.join(tmp, "chapters.txt")
+        write_chapters(metadata, chapters)
+
+        codec = ["-c:v", "libx264", "-preset", "medium", "-c:a", "aac"] if reencode else ["-c", "copy"]
+        subprocess.run(
+            ["ffmpeg", "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", concat_list,
+             "-i", metadata, "-map", "0", "-map_metadata", "1", "-map_chapters", "1", *codec,
+             "-movflags", "+faststart", output],
+            check=True
+        )
+    return offsets
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reencode", action="store_true", help="re-encode instead of stream copy")
+    args = parser.parse_args()
+
+    if not shutil.which("ffmpeg") or not shutil.which("ffprobe"):
+        print("❌ ffmpeg and ffprobe are required to build video bundles")
+        return 1
+
+    engine = AvatarEngine("http://bundler")
+    bundle_dir = os.path.join(VIDEO_ROOT, BUNDLE_DIR)
+    os.makedirs(bundle_dir, exist_ok=True)
+
+    manifest: Dict[str, Any] = {}
+    for flow, steps in flow_steps().items():
+        folders_done = set()
+        for language in registry.codes():
+            folder = registry.video_config(language)["video_folder"]
+            if folder in folders_done:
+                continue
+            folders_done.add(folder)
+
+            clips = []
+            for step in steps:
+                path = clip_path(engine, flow, step, language)
+                if path:
+                    clips.append((step, path))
+                else:
+                    print(f"⚠️  No {folder} clip for {flow}/{step} - left out of bundle")
+            if not clips:
+                continue
+
+            filename = f"{flow}_{folder}.mp4"
+            offsets = build_bundle(clips, os.path.join(bundle_dir, filename), args.reencode)
+            manifest.setdefault(flow, {})[folder] = {"file": f"{BUNDLE_DIR}/{filename}", "steps": offsets}
+            print(f"📦 {filename}: {len(clips)} steps, {max(end for _, end in offsets.values()):.1f}s")
+
+    with open(os.path.join(VIDEO_ROOT, BUNDLE_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"✅ Manifest written to videos/{BUNDLE_MANIFEST}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ const AvatarBooking = () => {
   const [currentStep, setCurrentStep] = useState('welcome');
   const [language, setLanguage] = useState('en');
   const [avatarVideo, setAvatarVideo] = useState('');
+  const [avatarSegment, setAvatarSegment] = useState(null);
   const [message, setMessage] = useState('');
   const [uid, setUid] = useState('');
   const [bookingData, setBookingData] = useState({});
@@ -20,6 +21,44 @@ const AvatarBooking = () => {
     startAvatarFlow(newUid);
   }, []);
 
+  // Play the step's segment inside the flow bundle when the backend provides one,
+  // so consecutive steps seek within one already-buffered file
+  useEffect(() => {
+    const video = videoRef.current;
+    if (!video || !avatarSegment) return;
+
+    const seek = () => {
+      video.currentTime = avatarSegment.start;
+      video.play();
+    };
+    const stopAtEnd = () => {
+      if (video.currentTime >= avatarSegment.end) video.pause();
+    };
+
+    if (video.readyState >= 1) {
+      seek();
+    } else {
+      video.addEventListener('loadedmetadata', seek, { once: true });
+    }
+    video.addEventListener('timeupdate', stopAtEnd);
+    return () => {
+      video.removeEventListener('loadedmetadata', seek);
+      video.removeEventListener('timeupdate', stopAtEnd);
+    };
+  }, [avatarSegment]);
+
+  const showAvatar = (data) => {
+    setAvatarSegment(data.avatar_segment || null);
+    setAvatarVideo(data.avatar_segment ? data.avatar_segment.url : data.avatar_video);
+  };
+
+  const replayVideo = () => {
+    const video = videoRef.current;
+    if (!video) return;
+    if (avatarSegment) video.currentTime = avatarSegment.start;
+    video.play();
+  };
+
   const generateUID = () => {
     return 'uid_' + Math.random().toString(36).substr(2, 9);
   };
@@ -40,7 +79,7 @@ const AvatarBooking = () => {
       const data = await response.json();
       if (data.type === 'avatar_flow') {
         setCurrentStep(data.step);
-        setAvatarVideo(data.avatar_video);
+        showAvatar(data);
         setMessage(data.message);
       }
     } catch (error) {
@@ -66,7 +105,7 @@ const AvatarBooking = () => {
       
       const data = await response.json();
       setCurrentStep(data.step);
-      setAvatarVideo(data.avatar_video);
+      showAvatar(data);
       setMessage(data.message);
       
       // Update booking data
@@ -154,7 +193,8 @@ const AvatarBooking = () => {
           <video 
             ref={videoRef}
             src={avatarVideo}
-            autoPlay
+            autoPlay={!avatarSegment}
+            preload="auto"
             controls
             className="avatar-video"
           />
@@ -176,7 +216,7 @@ const AvatarBooking = () => {
         <button onClick={() => window.history.back()} className="back-btn">
           Back
         </button>
-        <button onClick={() => videoRef.current?.play()} className="replay-btn">
+        <button onClick={replayVideo} className="replay-btn">
           Replay Video
         </button>
       </div>